@@ -0,0 +1,147 @@
+"""
+Precompressed, fingerprinted static assets.
+
+Every file under the static directory is read once at startup, hashed and
+compressed with gzip (and brotli when installed). Templates link to the
+fingerprinted name from `url()`, e.g. /static/styles.3fa2b1c9d0.css, which
+is served with a year-long immutable Cache-Control; plain names still work
+through the regular StaticFiles app.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import struct
+import zlib
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def compress(body: bytes):
+    """
+    Return the (gzip, brotli) encodings of `body`; brotli is None when unavailable.
+    """
+    gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+    brotlied = brotli.compress(body, quality=6) if brotli is not None else None
+    return gzipped, brotlied
+
+
+# gzip member header: deflate, no flags, no mtime, unknown OS
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+# An empty final deflate block with fixed Huffman codes
+DEFLATE_END = b"\x03\x00"
+
+
+def deflate_segment(body: bytes) -> bytes:
+    """
+    Raw deflate data for `body` ending on a byte boundary without a final block.
+
+    Segments can be concatenated in any order; `gzip_member` turns a sequence
+    of them into one gzip stream, so a page can be assembled from pieces
+    compressed ahead of time.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def gzip_member(segments, crc: int, length: int) -> bytes:
+    """
+    A gzip stream from deflate segments of data with the given CRC-32 and length.
+    """
+    return b"".join((GZIP_HEADER, *segments, DEFLATE_END, struct.pack("<II", crc, length & 0xFFFFFFFF)))
+
+
+def encoded_etag(digest: str, coding) -> str:
+    """
+    Strong ETag for one encoding of a body, so each encoding validates separately.
+    """
+    return f'"{digest}-{coding}"' if coding is not None else f'"{digest}"'
+
+
+def negotiate_encoding(accept_encoding: str, available):
+    """
+    Pick "br", "gzip" or None (identity) from an Accept-Encoding header.
+    """
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    for coding in ("br", "gzip"):
+        if coding in available and (coding in accepted or "*" in accepted):
+            return coding
+    return None
+
+
+class Asset:
+    __slots__ = ("media_type", "digest", "encodings")
+
+    def __init__(self, media_type, body):
+        self.media_type = media_type
+        self.digest = hashlib.sha1(body).hexdigest()
+        gzipped, brotlied = compress(body)
+        self.encodings = {None: body, "gzip": gzipped}
+        if brotlied is not None:
+            self.encodings["br"] = brotlied
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves fingerprinted assets precompressed from memory.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__(directory=directory)
+        self.assets = {}
+        self.fingerprinted = {}
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                full_path = os.path.join(root, filename)
+                path = os.path.relpath(full_path, directory).replace(os.sep, "/")
+                with open(full_path, "rb") as asset_file:
+                    body = asset_file.read()
+                stem, ext = os.path.splitext(path)
+                fingerprinted = f"{stem}.{hashlib.sha256(body).hexdigest()[:10]}{ext}"
+                media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                self.assets[fingerprinted] = Asset(media_type, body)
+                self.fingerprinted[path] = fingerprinted
+
+    def url(self, path: str) -> str:
+        """
+        URL of the fingerprinted copy of `path`, or of `path` itself if unknown.
+        """
+        return "/static/" + self.fingerprinted.get(path, path)
+
+    async def get_response(self, path: str, scope) -> Response:
+        asset = self.assets.get(path.replace(os.sep, "/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        coding = negotiate_encoding(request_headers.get("accept-encoding", ""), asset.encodings)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": encoded_etag(asset.digest, coding),
+            "Vary": "Accept-Encoding",
+        }
+        if request_headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+        body = asset.encodings[coding]
+        if scope["method"] == "HEAD":
+            response = Response(media_type=asset.media_type, headers=headers)
+            response.headers["Content-Length"] = str(len(body))
+            return response
+        return Response(body, media_type=asset.media_type, headers=headers)
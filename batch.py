@@ -0,0 +1,233 @@
+from datetime import date
+
+import numpy as np
+
+from numerology import CHALDEAN_CHART, VEDIC_MATRIX
+
+# Master Numbers kept by each reduction, mirroring the scalar calculators
+DESTINY_MASTER_NUMBERS = (11, 22, 33)
+CHALDEAN_MASTER_NUMBERS = (11, 22)
+
+# Letter values indexed by code point; anything outside ASCII scores 0
+CHALDEAN_VALUES = np.zeros(128, dtype=np.int64)
+for _letter, _value in CHALDEAN_CHART.items():
+    CHALDEAN_VALUES[ord(_letter)] = _value
+
+# Position of every grid cell in a (N, 9) table of digit counts for 1..9
+GRID_INDEX = np.array(VEDIC_MATRIX, dtype=np.int64) - 1
+
+# Days in each month of a common year, indexed by month - 1
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+# Day ordinal (`date.toordinal()`) of the datetime64 epoch
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def is_leap(years):
+    """
+    Vectorized `numerology.is_leap_year` over an integer array.
+    """
+    return ((years % 4 == 0) & (years % 100 != 0)) | (years % 400 == 0)
+
+
+def date_parts(ordinals):
+    """
+    Split an array of day ordinals into year, month and day arrays.
+    """
+    dates = (np.asarray(ordinals, dtype=np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+    month_starts = dates.astype("datetime64[M]")
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = month_starts.astype(np.int64) % 12 + 1
+    days = (dates - month_starts).astype(np.int64) + 1
+    return years, months, days
+
+
+def date_ordinals(years, months, days):
+    """
+    Day ordinals of year, month and day arrays (which must form valid dates).
+    """
+    years = np.asarray(years, dtype=np.int64)
+    month_starts = (years - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (months - 1)
+    return (month_starts.astype("datetime64[D]") + (days - 1)).astype(np.int64) + EPOCH_ORDINAL
+
+
+def digit_sums(values):
+    """
+    Sum the decimal digits of every value in an integer array.
+    """
+    values = np.array(values, dtype=np.int64)
+    total = np.zeros_like(values)
+    while values.any():
+        total += values % 10
+        values //= 10
+    return total
+
+
+def reduce_numbers(values, master_numbers):
+    """
+    Reduce every value to a single digit, keeping the given Master Numbers.
+
+    Equivalent to the `reduce_to_single_digit` loops of the scalar
+    calculators, but applied to the whole array one digit-sum pass at a time.
+    """
+    values = np.array(values, dtype=np.int64)
+    pending = (values > 9) & ~np.isin(values, master_numbers)
+    while pending.any():
+        values[pending] = digit_sums(values[pending])
+        pending = (values > 9) & ~np.isin(values, master_numbers)
+    return values
+
+
+def parse_birthdates(birthdates):
+    """
+    Split 'YYYY-MM-DD' strings into year, month and day arrays.
+
+    Args:
+    - birthdates (sequence of str): Birthdates in the format 'YYYY-MM-DD'
+
+    Returns:
+    - tuple: (years, months, days, valid) where `valid` flags the entries
+      that are well-formed calendar dates; invalid entries are zeroed.
+    """
+    # 11 characters is enough to tell apart strings longer than 10
+    raw = np.array(birthdates, dtype="U11").reshape(-1)
+    codes = raw.view(np.uint32).reshape(len(raw), 11).astype(np.int64)
+
+    digits = codes[:, [0, 1, 2, 3, 5, 6, 8, 9]] - ord("0")
+    valid = (
+        (codes[:, 10] == 0)
+        & (codes[:, 4] == ord("-"))
+        & (codes[:, 7] == ord("-"))
+        & ((digits >= 0) & (digits <= 9)).all(axis=1)
+    )
+    digits[~valid] = 0
+
+    years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    months = digits[:, 4] * 10 + digits[:, 5]
+    days = digits[:, 6] * 10 + digits[:, 7]
+
+    month_length = DAYS_IN_MONTH[np.clip(months, 1, 12) - 1] + ((months == 2) & is_leap(years))
+    valid &= (years >= 1) & (months >= 1) & (months <= 12) & (days >= 1) & (days <= month_length)
+
+    years[~valid] = 0
+    months[~valid] = 0
+    days[~valid] = 0
+    return years, months, days, valid
+
+
+def destiny_numbers(years, months, days):
+    """
+    Vectorized `calculate_destiny_number` over year, month and day arrays.
+    """
+    total = (
+        reduce_numbers(years, DESTINY_MASTER_NUMBERS)
+        + reduce_numbers(months, DESTINY_MASTER_NUMBERS)
+        + reduce_numbers(days, DESTINY_MASTER_NUMBERS)
+    )
+    return reduce_numbers(total, DESTINY_MASTER_NUMBERS)
+
+
+def root_numbers(days):
+    """
+    Vectorized `calculate_root_number` over an array of days of the month.
+    """
+    return reduce_numbers(digit_sums(days), DESTINY_MASTER_NUMBERS)
+
+
+def chaldean_numbers(names):
+    """
+    Vectorized `calculate_chaldean_number` over a sequence of names.
+
+    The names are upper-cased one by one (which may change their length, e.g.
+    'ß' -> 'SS'), then scored as one flat array of code points.
+    """
+    upper = [name.upper() for name in names]
+    lengths = np.fromiter(map(len, upper), dtype=np.int64, count=len(upper))
+    codes = np.frombuffer("".join(upper).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    values = CHALDEAN_VALUES[np.minimum(codes, 127)]
+
+    running = np.concatenate(([0], np.cumsum(values)))
+    ends = np.cumsum(lengths)
+    return reduce_numbers(running[ends] - running[ends - lengths], CHALDEAN_MASTER_NUMBERS)
+
+
+def vedic_frequencies(years, months, days, destiny=None, root=None):
+    """
+    How often each digit 1..9 counts towards the Vedic grid of each birthdate.
+
+    Returns:
+    - numpy.ndarray: (N, 9) array, column `d - 1` holding the count of digit `d`
+    """
+    years = np.asarray(years, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    if destiny is None:
+        destiny = destiny_numbers(years, months, days)
+    if root is None:
+        root = root_numbers(days)
+
+    # The first two digits of the year are dropped, as in the scalar version
+    root_counted = (days > 9) & (days % 10 != 0)
+    dob_digits = np.stack(
+        [
+            years // 10 % 10,
+            years % 10,
+            months // 10,
+            months % 10,
+            days // 10,
+            days % 10,
+            destiny,
+            np.where(root_counted, root, 0),
+        ],
+        axis=1,
+    )
+    return (dob_digits[:, :, None] == np.arange(1, 10)).sum(axis=1)
+
+
+def vedic_grid_counts(years, months, days, destiny=None, root=None):
+    """
+    Vectorized `generate_vedic_grid_dynamic` returning digit counts.
+
+    Returns:
+    - numpy.ndarray: (N, 3, 3) array holding how often each cell of
+      VEDIC_MATRIX appears in the birthdate.
+    """
+    return vedic_frequencies(years, months, days, destiny, root)[:, GRID_INDEX]
+
+
+def vedic_grid_strings(counts):
+    """
+    Turn (N, 3, 3) grid counts into the string grids `generate_vedic_grid_dynamic` returns.
+    """
+    # A date has at most 8 counted digits, so every cell string can be precomputed
+    c0, c1, c2, c3, c4, c5, c6, c7, c8 = (
+        [str(num) * count for count in range(9)] for row in VEDIC_MATRIX for num in row
+    )
+    return [
+        [[c0[a], c1[b], c2[c]], [c3[d], c4[e], c5[f]], [c6[g], c7[h], c8[i]]]
+        for a, b, c, d, e, f, g, h, i in np.asarray(counts).reshape(-1, 9).tolist()
+    ]
+
+
+def batch_report(names, birthdates):
+    """
+    Calculate the name and birthdate numbers for many people at once.
+
+    Args:
+    - names (sequence of str): Names to score with the Chaldean chart
+    - birthdates (sequence of str): Birthdates in the format 'YYYY-MM-DD'
+
+    Returns:
+    - dict: Arrays of `chaldean_number`, `destiny_number`, `root_number`,
+      (N, 3, 3) `grid_counts` and the `valid` birthdate mask.
+    """
+    years, months, days, valid = parse_birthdates(birthdates)
+    destiny = destiny_numbers(years, months, days)
+    root = root_numbers(days)
+    return {
+        "chaldean_number": chaldean_numbers(names),
+        "destiny_number": destiny,
+        "root_number": root,
+        "grid_counts": vedic_grid_counts(years, months, days, destiny, root),
+        "valid": valid,
+    }
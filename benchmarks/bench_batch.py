@@ -0,0 +1,88 @@
+"""
+Throughput benchmark: vectorized batch engine vs. the scalar calculators.
+
+Usage:
+    python benchmarks/bench_batch.py --size 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch  # noqa: E402
+from numerology import (  # noqa: E402
+    calculate_chaldean_number,
+    calculate_destiny_number,
+    calculate_root_number,
+    generate_vedic_grid_dynamic,
+)
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Saanvi", "Vivaan", "Zara", "José", "Søren"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Mathur", "Nair", "O'Brien", "Müller", "Straße"]
+
+
+def make_cohort(size, seed):
+    rng = random.Random(seed)
+    first_day = date(1900, 1, 1)
+    span = (date(2100, 12, 31) - first_day).days
+    names = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(size)]
+    birthdates = [(first_day + timedelta(days=rng.randint(0, span))).isoformat() for _ in range(size)]
+    return names, birthdates
+
+
+def run_scalar(names, birthdates):
+    return [
+        (
+            calculate_chaldean_number(name),
+            calculate_destiny_number(birthdate),
+            calculate_root_number(birthdate),
+            generate_vedic_grid_dynamic(birthdate),
+        )
+        for name, birthdate in zip(names, birthdates)
+    ]
+
+
+def run_vectorized(names, birthdates):
+    report = batch.batch_report(names, birthdates)
+    return list(zip(
+        report["chaldean_number"].tolist(),
+        report["destiny_number"].tolist(),
+        report["root_number"].tolist(),
+        batch.vedic_grid_strings(report["grid_counts"]),
+    ))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000, help="number of (name, birthdate) pairs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    names, birthdates = make_cohort(args.size, args.seed)
+    scalar, scalar_seconds = timed(run_scalar, names, birthdates)
+    vectorized, vectorized_seconds = timed(run_vectorized, names, birthdates)
+    _, arrays_seconds = timed(batch.batch_report, names, birthdates)
+
+    if scalar != vectorized:
+        mismatch = next(i for i, pair in enumerate(zip(scalar, vectorized)) if pair[0] != pair[1])
+        sys.exit(f"Mismatch at {names[mismatch]!r} {birthdates[mismatch]}: {scalar[mismatch]} != {vectorized[mismatch]}")
+
+    print(f"rows:       {args.size}")
+    print(f"scalar:     {scalar_seconds:.3f}s ({args.size / scalar_seconds:,.0f} rows/s)")
+    print(f"vectorized: {vectorized_seconds:.3f}s ({args.size / vectorized_seconds:,.0f} rows/s)")
+    print(f"arrays:     {arrays_seconds:.3f}s ({args.size / arrays_seconds:,.0f} rows/s, without string grids)")
+    print(f"speedup:    {scalar_seconds / vectorized_seconds:.1f}x ({scalar_seconds / arrays_seconds:.1f}x arrays only)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Parity check and throughput of the vectorized sub-period calendar against
+`update_vedic_grid`, one call per timeline year.
+
+Every year of the timeline of each sampled birthdate is compared, as are
+active-period lookups against a linear scan of the date ranges.
+
+Usage:
+    python benchmarks/bench_pratyantar.py --size 2000 --years 90
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numerology import update_vedic_grid  # noqa: E402
+from pratyantar import PratyantarCalendar, active_periods  # noqa: E402
+from timeline import iter_timeline  # noqa: E402
+
+EMPTY_GRID = [["", "", ""], ["", "", ""], ["", "", ""]]
+
+
+def make_birthdates(size, seed):
+    rng = random.Random(seed)
+    first_day = date(1900, 1, 1)
+    birthdates = []
+    while len(birthdates) < size:
+        birthdate = first_day + timedelta(days=rng.randint(0, 73000))
+        if (birthdate.month, birthdate.day) != (2, 29):
+            birthdates.append(birthdate.isoformat())
+    return birthdates
+
+
+def run_scalar(birthdate, years):
+    rows = []
+    for period in iter_timeline(birthdate, end_year=int(birthdate[:4]) + years - 1):
+        _, date_ranges = update_vedic_grid(EMPTY_GRID, period["mahadasha"], period["antardasha"], period["start_date"])
+        for date_range in date_ranges:
+            rows.append({
+                "year": period["year"],
+                "mahadasha": period["mahadasha"],
+                "antardasha": period["antardasha"],
+                **date_range,
+            })
+    return rows
+
+
+def run_vectorized(birthdate, years):
+    return list(PratyantarCalendar(birthdate, end_year=int(birthdate[:4]) + years - 1).rows())
+
+
+def parse_ranges(rows):
+    return [
+        (datetime.strptime(row["start_date"], "%d-%m-%Y").date(), datetime.strptime(row["end_date"], "%d-%m-%Y").date(), row)
+        for row in rows
+    ]
+
+
+def scan_active(ranges, day):
+    for first, last, row in ranges:
+        if first <= day <= last:
+            return row
+    return None
+
+
+def check_active(birthdate, rows, rng, samples):
+    ranges = parse_ranges(rows)
+    first = date.fromisoformat(birthdate) - timedelta(days=30)
+    last = ranges[-1][1]
+    days = [first + timedelta(days=rng.randint(0, (last - first).days)) for _ in range(samples)]
+    for result, day in zip(active_periods(birthdate, [day.isoformat() for day in days]), days):
+        if result["period"] != scan_active(ranges, day):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=2000, help="Number of birthdates")
+    parser.add_argument("--years", type=int, default=90, help="Timeline years per birthdate")
+    parser.add_argument("--active-samples", type=int, default=20, help="Active-period lookups checked per birthdate")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    birthdates = make_birthdates(args.size, args.seed)
+
+    start = time.perf_counter()
+    scalar = [run_scalar(birthdate, args.years) for birthdate in birthdates]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = [run_vectorized(birthdate, args.years) for birthdate in birthdates]
+    vectorized_seconds = time.perf_counter() - start
+
+    mismatches = [birthdate for birthdate, a, b in zip(birthdates, scalar, vectorized) if a != b]
+    rng = random.Random(args.seed)
+    active_mismatches = [
+        birthdate for birthdate, rows in zip(birthdates, scalar)
+        if not check_active(birthdate, rows, rng, args.active_samples)
+    ]
+
+    periods = sum(len(rows) for rows in scalar)
+    print(f"{len(birthdates)} birthdates x {args.years} years = {periods} sub-periods")
+    print(f"update_vedic_grid:  {scalar_seconds:8.3f} s  ({periods / scalar_seconds:12.0f} periods/s)")
+    print(f"PratyantarCalendar: {vectorized_seconds:8.3f} s  ({periods / vectorized_seconds:12.0f} periods/s)")
+    print(f"speedup: {scalar_seconds / vectorized_seconds:.1f}x")
+    print(f"calendar mismatches: {len(mismatches)}, active-period mismatches: {len(active_mismatches)}")
+    if mismatches or active_mismatches:
+        print("first mismatch:", (mismatches or active_mismatches)[0])
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
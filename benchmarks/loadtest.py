@@ -0,0 +1,141 @@
+"""
+Load test: p50/p99 latency of /result, /update-grid and a static file under concurrent load.
+
+Against a running server:
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000
+
+Or start one server per executor mode and compare, e.g. before (inline,
+work on the event loop) and after (thread pool):
+    python benchmarks/loadtest.py --modes inline thread
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+
+import httpx
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(url, total, concurrency, distinct, seed):
+    rng = random.Random(seed)
+    first_day = date(1900, 1, 1)
+    birthdates = [(first_day + timedelta(days=rng.randint(0, 73000))).isoformat() for _ in range(distinct)]
+    latencies = {"/result": [], "/update-grid": [], "/static": []}
+    statuses = {}
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker(client):
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            birthdate = birthdates[i % distinct]
+            start = time.perf_counter()
+            if i % 3 == 2:
+                route = "/static"
+                response = await client.get("/static/styles.css")
+            else:
+                route = "/result"
+                response = await client.post("/result", data={"name": f"Person {i}", "birthdate": birthdate})
+                match = re.search(r'data-report-id="([^"]+)"', response.text)
+                if match and i % 3 == 1:
+                    latencies[route].append(time.perf_counter() - start)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    route = "/update-grid"
+                    start = time.perf_counter()
+                    year = int(birthdate[:4]) + 1
+                    response = await client.get("/update-grid", params={
+                        "report_id": match.group(1),
+                        "mahadasha": 1,
+                        "antardasha": 1,
+                        "start_date": f"{birthdate[8:]}-{birthdate[5:7]}-{year}",
+                    })
+            latencies[route].append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, statuses, elapsed
+
+
+def report(label, latencies, statuses, elapsed):
+    count = sum(len(samples) for samples in latencies.values())
+    print(f"== {label}: {count} requests in {elapsed:.2f}s ({count / elapsed:.0f} req/s), status {statuses}")
+    for route, samples in latencies.items():
+        if samples:
+            print(
+                f"  {route:<13} n={len(samples):<6} "
+                f"p50={percentile(samples, 0.50) * 1000:7.1f}ms  p99={percentile(samples, 0.99) * 1000:7.1f}ms"
+            )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port):
+    env = dict(os.environ, NUMERO_EXECUTOR=mode)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_DIR, env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"Server for mode {mode} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="test an already running server")
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread"], help="executor modes to compare")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--distinct", type=int, default=500, help="number of distinct birthdates")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.url:
+        report(args.url, *asyncio.run(run_load(args.url, args.requests, args.concurrency, args.distinct, args.seed)))
+        return
+
+    for mode in args.modes:
+        port = free_port()
+        server = start_server(mode, port)
+        try:
+            url = f"http://127.0.0.1:{port}"
+            report(f"NUMERO_EXECUTOR={mode}", *asyncio.run(
+                run_load(url, args.requests, args.concurrency, args.distinct, args.seed)
+            ))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
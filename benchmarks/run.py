@@ -0,0 +1,222 @@
+"""
+Benchmark suite: micro-benchmarks of the functions in main.py and in-process
+end-to-end benchmarks of /result and /update-grid through the ASGI app.
+
+Results are written as JSON (default benchmarks/results/<timestamp>.json) so
+runs can be compared:
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --compare before.json --threshold 0.1
+
+`--compare` exits with status 1 when any benchmark got slower by more than
+the threshold (a fraction of the baseline median).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import main  # noqa: E402
+
+
+def make_birthdates(count, seed):
+    rng = random.Random(seed)
+    first_day = date(1900, 1, 1)
+    return [(first_day + timedelta(days=rng.randint(0, 73000))).isoformat() for _ in range(count)]
+
+
+def summarize(samples):
+    """
+    Statistics in seconds per call.
+    """
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p99": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+    }
+
+
+def micro(func, repeat, number):
+    timer = timeit.Timer(func)
+    return summarize([total / number for total in timer.repeat(repeat=repeat, number=number)])
+
+
+def run_micro(birthdates, repeat, number):
+    birthdate = birthdates[0]
+    start_date = datetime.strptime(birthdate, "%Y-%m-%d").strftime("%d-%m-%Y")
+    report = main.birthdate_report(birthdate)
+    fragments = {kind: main.render_fragment(kind, report) for kind in main.FRAGMENT_TEMPLATES}
+    page = {
+        "name": "Atin Mathur",
+        "birthdate": birthdate,
+        "chaldean_number": main.calculate_chaldean_number("Atin Mathur"),
+        "destiny_number": report["destiny_number"],
+        "root_number": report["root_number"],
+        "report_id": "0" * 32,
+        "precompute_overlays": False,
+    }
+    names = ["Atin Mathur"] * 1000
+    cohort = (birthdates * (1000 // len(birthdates) + 1))[:1000]
+
+    benchmarks = {
+        "calculate_chaldean_number": lambda: main.calculate_chaldean_number("Atin Mathur"),
+        "calculate_destiny_number": lambda: main.calculate_destiny_number(birthdate),
+        "calculate_root_number": lambda: main.calculate_root_number(birthdate),
+        "generate_vedic_grid_dynamic": lambda: main.generate_vedic_grid_dynamic(birthdate),
+        "calculate_mahadasha_antardasha": lambda: main.calculate_mahadasha_antardasha(birthdate),
+        "update_vedic_grid": lambda: main.update_vedic_grid(report["vedic_grid"], 2, 7, start_date),
+        "birthdate_report": lambda: main.birthdate_report(birthdate),
+        "render_fragment.vedic_grid": lambda: main.render_fragment("vedic_grid", report),
+        "render_fragment.mahadasha_rows": lambda: main.render_fragment("mahadasha_rows", report),
+        "render_result_page": lambda: main.render_result_page(page, fragments),
+        "render_result_page.gzip": lambda: main.render_result_page(page, fragments, "gzip"),
+        "year_overlays": lambda: main.year_overlays(report),
+        "batch_results[1000]": lambda: main.batch_results(names, cohort),
+        "ndjson_chunks[90]": lambda: "".join(main.ndjson_chunks(main.iter_timeline(birthdate))),
+    }
+    results = {}
+    for label, func in benchmarks.items():
+        results[f"micro.{label}"] = micro(func, repeat, number)
+        print(f"  {label:<34} median {results[f'micro.{label}']['median'] * 1e6:10.1f} us")
+    return results
+
+
+async def run_e2e(birthdates, requests):
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.lifespan(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            report_ids = {}
+            cold = []
+            for birthdate in birthdates:
+                start = time.perf_counter()
+                response = await client.post("/result", data={"name": "Atin Mathur", "birthdate": birthdate})
+                cold.append(time.perf_counter() - start)
+                response.raise_for_status()
+                report_ids[birthdate] = re.search(r'data-report-id="([^"]+)"', response.text).group(1)
+            results["e2e./result.cold"] = summarize(cold)
+
+            warm = []
+            for i in range(requests):
+                birthdate = birthdates[i % len(birthdates)]
+                start = time.perf_counter()
+                response = await client.post("/result", data={"name": "Atin Mathur", "birthdate": birthdate})
+                warm.append(time.perf_counter() - start)
+                response.raise_for_status()
+            results["e2e./result.warm"] = summarize(warm)
+
+            update = []
+            for i in range(requests):
+                birthdate = birthdates[i % len(birthdates)]
+                start_date = f"{birthdate[8:10]}-{birthdate[5:7]}-{int(birthdate[:4]) + i % 90}"
+                params = {"report_id": report_ids[birthdate], "mahadasha": i % 9 + 1,
+                          "antardasha": (i + 4) % 9 + 1, "start_date": start_date}
+                start = time.perf_counter()
+                response = await client.get("/update-grid", params=params)
+                update.append(time.perf_counter() - start)
+                response.raise_for_status()
+            results["e2e./update-grid"] = summarize(update)
+
+            overlays = []
+            for birthdate in birthdates:
+                start = time.perf_counter()
+                response = await client.get("/update-grid", params={"report_id": report_ids[birthdate], "all": "true"})
+                overlays.append(time.perf_counter() - start)
+                response.raise_for_status()
+            results["e2e./update-grid?all"] = summarize(overlays)
+
+    for label, stats in results.items():
+        print(f"  {label[4:]:<34} median {stats['median'] * 1e3:8.2f} ms  p99 {stats['p99'] * 1e3:8.2f} ms")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for label, stats in sorted(results.items()):
+        before = baseline.get(label)
+        if before is None:
+            continue
+        change = stats["median"] / before["median"] - 1
+        flag = "REGRESSION" if change > threshold else ""
+        print(f"  {label:<42} {before['median'] * 1e6:12.1f} us -> {stats['median'] * 1e6:12.1f} us  {change:+7.1%} {flag}")
+        if flag:
+            regressions.append(label)
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown as a fraction (default 0.1)")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing rounds per micro-benchmark")
+    parser.add_argument("--number", type=int, default=200, help="Calls per micro-benchmark round")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per end-to-end benchmark")
+    parser.add_argument("--birthdates", type=int, default=50, help="Distinct birthdates used")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    args = parser.parse_args()
+
+    birthdates = make_birthdates(args.birthdates, args.seed)
+    results = {}
+    if not args.skip_micro:
+        print("micro-benchmarks (per call):")
+        results.update(run_micro(birthdates, args.repeat, args.number))
+    if not args.skip_e2e:
+        print("end-to-end (in-process ASGI):")
+        results.update(asyncio.run(run_e2e(birthdates, args.requests)))
+
+    started = datetime.now(timezone.utc)
+    document = {
+        "timestamp": started.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": git_commit(),
+        "executor": main.compute.mode,
+        "settings": vars(args),
+        "benchmarks": results,
+    }
+    output = args.output or os.path.join(REPO_DIR, "benchmarks", "results", started.strftime("%Y%m%dT%H%M%SZ") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as results_file:
+        json.dump(document, results_file, indent=2)
+    print(f"wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["benchmarks"]
+        print(f"compared with {args.compare}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the {args.threshold:.0%} threshold")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,235 @@
+"""
+Precomputed table of every value that depends only on the birthdate.
+
+Build it once with:
+
+    python birthtable.py --output data/birthdate_table.bin
+
+The app memory-maps the file at startup, so every uvicorn worker shares the
+same pages and a lookup is a single fixed-width read keyed by day ordinal.
+"""
+import argparse
+import hashlib
+import importlib
+import logging
+import mmap
+import os
+import struct
+from collections import namedtuple
+from datetime import date, timedelta
+
+from numerology import (
+    VEDIC_MATRIX,
+    calculate_destiny_number,
+    calculate_root_number,
+    generate_vedic_grid_dynamic,
+    calculate_mahadasha_antardasha,
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NUMEROBT"
+FORMAT_VERSION = 1
+NUM_YEARS = 90
+
+# Modules whose source the table is derived from; editing them invalidates it
+SOURCE_MODULES = ("numerology", "timeline")
+
+# magic, version, record size, years per timeline, source fingerprint,
+# first day ordinal, number of days
+HEADER = struct.Struct("<8sHHH32sII")
+HEADER_SIZE = 64
+
+# destiny, root, flags, digit frequencies 1..9, mahadasha order,
+# one (mahadasha << 4 | antardasha) byte per timeline year
+RECORD = struct.Struct(f"<BBB9s9s{NUM_YEARS}s")
+HAS_TIMELINE = 0x01
+
+BirthdateRecord = namedtuple(
+    "BirthdateRecord",
+    ["destiny_number", "root_number", "frequency", "mahadasha_order", "timeline"],
+)
+
+
+def source_fingerprint():
+    """
+    Hash the format version and the source of the calculators the table is built from.
+    """
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode())
+    for name in SOURCE_MODULES:
+        with open(importlib.import_module(name).__file__, "rb") as source:
+            digest.update(source.read())
+    return digest.digest()
+
+
+def birthdate_ordinal(birthdate: str):
+    """
+    Return the day ordinal of a 'YYYY-MM-DD' birthdate, or None if it is not in that exact format.
+    """
+    if len(birthdate) != 10 or birthdate[4] != "-" or birthdate[7] != "-":
+        return None
+    try:
+        return date(int(birthdate[:4]), int(birthdate[5:7]), int(birthdate[8:])).toordinal()
+    except ValueError:
+        return None
+
+
+def encode_record(birthdate: str) -> bytes:
+    """
+    Run the calculators for one birthdate and pack their results into a record.
+    """
+    grid = generate_vedic_grid_dynamic(birthdate)
+    frequency = [0] * 9
+    for row_index, row in enumerate(VEDIC_MATRIX):
+        for col_index, num in enumerate(row):
+            frequency[num - 1] = len(grid[row_index][col_index])
+
+    try:
+        periods = calculate_mahadasha_antardasha(birthdate, NUM_YEARS)
+    except ValueError:
+        # February 29 birthdays have no birthday in common years
+        periods = None
+
+    flags = 0
+    order = []
+    timeline = bytes(NUM_YEARS)
+    if periods is not None:
+        flags |= HAS_TIMELINE
+        for period in periods:
+            if period["mahadasha"] not in order:
+                order.append(period["mahadasha"])
+        timeline = bytes(period["mahadasha"] << 4 | period["antardasha"] for period in periods)
+
+    return RECORD.pack(
+        calculate_destiny_number(birthdate),
+        calculate_root_number(birthdate),
+        flags,
+        bytes(frequency),
+        bytes(order),
+        timeline,
+    )
+
+
+def build_table(path: str, start_year: int = 1900, end_year: int = 2100):
+    """
+    Write the table for every day from January 1 of `start_year` to December 31 of `end_year`.
+    """
+    first_day = date(start_year, 1, 1)
+    count = (date(end_year, 12, 31) - first_day).days + 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as table:
+        header = HEADER.pack(
+            MAGIC, FORMAT_VERSION, RECORD.size, NUM_YEARS,
+            source_fingerprint(), first_day.toordinal(), count,
+        )
+        table.write(header.ljust(HEADER_SIZE, b"\0"))
+        for offset in range(count):
+            table.write(encode_record((first_day + timedelta(days=offset)).isoformat()))
+    # Replace atomically so running workers never map a half-written file
+    os.replace(tmp_path, path)
+    return count
+
+
+class BirthdateTable:
+    """
+    Read-only, memory-mapped view of a table written by `build_table`.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as table:
+            self._mmap = mmap.mmap(table.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, record_size, num_years, fingerprint, first_ordinal, count = (
+                HEADER.unpack_from(self._mmap)
+            )
+        except struct.error:
+            self.close()
+            raise ValueError(f"{path} is not a birthdate table")
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size or num_years != NUM_YEARS:
+            self.close()
+            raise ValueError(f"{path} was written in an incompatible format")
+        if fingerprint != source_fingerprint():
+            self.close()
+            raise ValueError(f"{path} is out of date with the calculators")
+        if len(self._mmap) != HEADER_SIZE + count * RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+        self.first_ordinal = first_ordinal
+        self.count = count
+
+    def close(self):
+        self._mmap.close()
+
+    def lookup(self, birthdate: str):
+        """
+        Return the BirthdateRecord for a 'YYYY-MM-DD' birthdate, or None if it is not in the table.
+        """
+        ordinal = birthdate_ordinal(birthdate)
+        if ordinal is None or not 0 <= ordinal - self.first_ordinal < self.count:
+            return None
+
+        destiny, root, flags, frequency, order, timeline = RECORD.unpack_from(
+            self._mmap, HEADER_SIZE + (ordinal - self.first_ordinal) * RECORD.size
+        )
+        if not flags & HAS_TIMELINE:
+            order = timeline = None
+        return BirthdateRecord(destiny, root, frequency, order, timeline)
+
+    def report(self, birthdate: str):
+        """
+        Rebuild the birthdate-only results in the shapes the calculators return.
+
+        Returns None when the birthdate is outside the table or has no
+        timeline, so the caller can fall back to the calculators.
+        """
+        record = self.lookup(birthdate)
+        if record is None or record.timeline is None:
+            return None
+
+        year, month, day = int(birthdate[:4]), birthdate[5:7], birthdate[8:]
+        vedic_grid = [[str(num) * record.frequency[num - 1] for num in row] for row in VEDIC_MATRIX]
+        mahadasha_periods = [
+            {
+                "year": year + i,
+                "start_date": f"{day}-{month}-{year + i}",
+                "running_age": i + 1,
+                "mahadasha": packed >> 4,
+                "antardasha": packed & 0x0F,
+            }
+            for i, packed in enumerate(record.timeline)
+        ]
+        return {
+            "destiny_number": record.destiny_number,
+            "root_number": record.root_number,
+            "vedic_grid": vedic_grid,
+            "mahadasha_periods": mahadasha_periods,
+        }
+
+
+def open_table(path: str):
+    """
+    Open the table at `path`, or return None (so callers fall back to the calculators) if it is missing or stale.
+    """
+    if not os.path.exists(path):
+        logger.info("Birthdate table %s not found, using the calculators", path)
+        return None
+    try:
+        return BirthdateTable(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring birthdate table: %s", exc)
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the precomputed birthdate table.")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "birthdate_table.bin"))
+    parser.add_argument("--start-year", type=int, default=1900)
+    parser.add_argument("--end-year", type=int, default=2100)
+    args = parser.parse_args()
+
+    days = build_table(args.output, args.start_year, args.end_year)
+    print(f"Wrote {days} days to {args.output}")
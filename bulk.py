@@ -0,0 +1,313 @@
+"""
+Streaming bulk pipeline: CSV of (name, birthdate) rows in, CSV or NDJSON out.
+
+The upload is parsed as it arrives (`UploadStream`), rows are read lazily in
+chunks and scored by a process pool with a bounded number of chunks in
+flight, so memory and disk use stay flat whatever the file size.
+Rows that cannot be scored are written to a per-job error stream instead of
+aborting the job.
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import anyio
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.responses import StreamingResponse
+
+from birthtable import birthdate_ordinal
+from numerology import (
+    calculate_chaldean_number,
+    calculate_destiny_number,
+    calculate_root_number,
+    generate_vedic_grid_dynamic,
+)
+
+BULK_WORKERS = int(os.environ.get("NUMERO_BULK_WORKERS", str(os.cpu_count() or 1)))
+BULK_CHUNK_ROWS = int(os.environ.get("NUMERO_BULK_CHUNK_ROWS", "2000"))
+BULK_MAX_INFLIGHT = int(os.environ.get("NUMERO_BULK_MAX_INFLIGHT", str(2 * BULK_WORKERS)))
+BULK_ERROR_DIR = os.environ.get("NUMERO_BULK_ERROR_DIR", os.path.join(tempfile.gettempdir(), "numero-bulk"))
+# Error streams older than this many seconds are removed when a new job starts
+BULK_ERROR_TTL = int(os.environ.get("NUMERO_BULK_ERROR_TTL", "86400"))
+
+OUTPUT_FORMATS = ("csv", "ndjson")
+RESULT_FIELDS = ["line", "name", "birthdate", "chaldean_number", "destiny_number", "root_number", "vedic_grid"]
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=BULK_WORKERS)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def score_row(name, birthdate):
+    """
+    Score one row with the calculators, returning (result, error).
+    """
+    if name is None or not name.strip():
+        return None, "Name is empty"
+    if birthdate is None or birthdate_ordinal(birthdate) is None:
+        return None, "Birthdate must be a valid date in the format YYYY-MM-DD"
+    return {
+        "name": name,
+        "birthdate": birthdate,
+        "chaldean_number": calculate_chaldean_number(name),
+        "destiny_number": calculate_destiny_number(birthdate),
+        "root_number": calculate_root_number(birthdate),
+        "vedic_grid": generate_vedic_grid_dynamic(birthdate),
+    }, None
+
+
+def process_chunk(rows, output_format):
+    """
+    Score a chunk of (line, name, birthdate) rows in a worker process.
+
+    Returns:
+    - tuple: (serialized output, list of error records)
+    """
+    output = io.StringIO()
+    writer = csv.writer(output) if output_format == "csv" else None
+    errors = []
+    for line, name, birthdate in rows:
+        result, error = score_row(name, birthdate)
+        if error is not None:
+            errors.append({"line": line, "name": name, "birthdate": birthdate, "error": error})
+            continue
+        result["line"] = line
+        if writer is not None:
+            result["vedic_grid"] = json.dumps(result["vedic_grid"], separators=(",", ":"))
+            writer.writerow([result[field] for field in RESULT_FIELDS])
+        else:
+            output.write(json.dumps({field: result[field] for field in RESULT_FIELDS}) + "\n")
+    return output.getvalue(), errors
+
+
+class UploadStream(io.RawIOBase):
+    """
+    Readable binary file over the CSV in a request body, read as the bytes arrive.
+
+    The body is either the CSV itself or multipart/form-data with the CSV in
+    the `file` field, which is parsed incrementally instead of being spooled
+    to a temporary file. `chunks` is the async iterator of body chunks
+    (`request.stream()`); the file is read from a worker thread, which fetches
+    further chunks on the event loop.
+    """
+
+    def __init__(self, chunks, content_type: str):
+        super().__init__()
+        self._chunks = chunks
+        self._buffer = bytearray()
+        # Set once the CSV has been read completely
+        self.finished = anyio.Event()
+
+        media_type, options = parse_options_header(content_type or "")
+        self.multipart = media_type == b"multipart/form-data" and b"boundary" in options
+        self.found = media_type == b"text/csv"
+        if self.multipart:
+            self._header_field = b""
+            self._header_value = b""
+            self._part_name = None
+            self._in_file = False
+            self._parser = MultipartParser(options[b"boundary"], {
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            })
+
+    def _on_part_begin(self):
+        self._part_name = None
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            self._part_name = parse_options_header(self._header_value)[1].get(b"name")
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        # Only the first `file` part is read
+        self._in_file = self._part_name == b"file" and not self.found
+        self.found = self.found or self._in_file
+
+    def _on_part_data(self, data, start, end):
+        if self._in_file:
+            self._buffer += data[start:end]
+
+    def _on_part_end(self):
+        if self._in_file:
+            self._in_file = False
+            self.finished.set()
+
+    async def _receive(self):
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            if self.multipart:
+                self._parser.finalize()
+            self.finished.set()
+            return
+        if self.multipart:
+            self._parser.write(chunk)
+        else:
+            self._buffer += chunk
+
+    async def find_file(self) -> bool:
+        """
+        Read the body up to the start of the CSV; False if it holds no CSV.
+        """
+        while self.multipart and not self.found and not self.finished.is_set():
+            await self._receive()
+        return self.found
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer and not self.finished.is_set():
+            anyio.from_thread.run(self._receive)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    Streaming response sent while the upload it answers is still being read.
+
+    StreamingResponse watches for a client disconnect by consuming `receive`,
+    which would swallow body chunks, so this only starts watching once the
+    upload has been read.
+    """
+
+    def __init__(self, content, upload: UploadStream, **kwargs):
+        super().__init__(content, **kwargs)
+        self.upload = upload
+
+    async def __call__(self, scope, receive, send):
+        async with anyio.create_task_group() as task_group:
+
+            async def wrap(func):
+                await func()
+                task_group.cancel_scope.cancel()
+
+            async def listen_after_upload():
+                await self.upload.finished.wait()
+                await self.listen_for_disconnect(receive)
+
+            task_group.start_soon(wrap, partial(self.stream_response, send))
+            await wrap(listen_after_upload)
+
+        if self.background is not None:
+            await self.background()
+
+
+def iter_chunks(binary_file, chunk_rows, errors):
+    """
+    Lazily read a CSV with `name` and `birthdate` columns in chunks of
+    (line, name, birthdate) rows, where `line` is the row's line in the file.
+
+    Lines the CSV reader cannot parse are appended to `errors`.
+    """
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        reader = csv.DictReader(text)
+        chunk = []
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as exc:
+                errors.append({"line": reader.line_num, "error": f"Unreadable CSV row: {exc}"})
+                continue
+            chunk.append((reader.line_num, row.get("name"), row.get("birthdate")))
+            if len(chunk) == chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        # Leave the underlying upload open for its owner to close
+        text.detach()
+
+
+def error_stream_path(job_id):
+    return os.path.join(BULK_ERROR_DIR, f"{job_id}.ndjson")
+
+
+def remove_stale_error_streams():
+    if not os.path.isdir(BULK_ERROR_DIR):
+        return
+    cutoff = time.time() - BULK_ERROR_TTL
+    for entry in os.scandir(BULK_ERROR_DIR):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def stream_job(binary_file, output_format, job_id):
+    """
+    Yield the scored output of a bulk job chunk by chunk, in input order.
+
+    At most BULK_MAX_INFLIGHT chunks are queued on the process pool; reading
+    pauses until the oldest one has been written out.
+    """
+    executor = get_executor()
+    pending = deque()
+    parse_errors = []
+    os.makedirs(BULK_ERROR_DIR, exist_ok=True)
+    with open(error_stream_path(job_id), "w", encoding="utf-8") as error_stream:
+
+        def write_errors(errors):
+            for error in errors:
+                error_stream.write(json.dumps(error) + "\n")
+            error_stream.flush()
+
+        try:
+            if output_format == "csv":
+                yield ",".join(RESULT_FIELDS) + "\r\n"
+            for chunk in iter_chunks(binary_file, BULK_CHUNK_ROWS, parse_errors):
+                write_errors(parse_errors)
+                parse_errors.clear()
+                pending.append(executor.submit(process_chunk, chunk, output_format))
+                if len(pending) >= BULK_MAX_INFLIGHT:
+                    output, errors = pending.popleft().result()
+                    write_errors(errors)
+                    yield output
+            write_errors(parse_errors)
+            while pending:
+                output, errors = pending.popleft().result()
+                write_errors(errors)
+                yield output
+        finally:
+            # The client went away or a chunk failed: drop the queued work
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,122 @@
+"""
+Reverse index from numerology values to the dates that produce them.
+
+For every day in a fixed span the destiny number, root number and Vedic grid
+digit counts are computed once (vectorized). Each value gets a packed bitmap
+with one bit per day, so a query such as "destiny 8 and root 1, at least two
+1s and no 5 in the grid" is a handful of bitwise operations over the span.
+"""
+from datetime import date
+
+import numpy as np
+
+import batch
+
+
+class DateIndex:
+    """
+    Bitmaps over every day from `start` to `end` (inclusive).
+    """
+
+    def __init__(self, start: date, end: date):
+        if end < start:
+            raise ValueError("The index must end on or after its start")
+        self.start = start
+        self.end = end
+        self.start_ordinal = start.toordinal()
+        self.size = end.toordinal() - self.start_ordinal + 1
+
+        years, months, days = batch.date_parts(np.arange(self.size, dtype=np.int64) + self.start_ordinal)
+
+        self.destiny_numbers = batch.destiny_numbers(years, months, days).astype(np.int8)
+        self.root_numbers = batch.root_numbers(days).astype(np.int8)
+        frequencies = batch.vedic_frequencies(years, months, days, self.destiny_numbers, self.root_numbers)
+
+        self.destiny = {int(value): self._pack(self.destiny_numbers == value) for value in np.unique(self.destiny_numbers)}
+        self.root = {int(value): self._pack(self.root_numbers == value) for value in np.unique(self.root_numbers)}
+        # grid[digit][count]: days on which `digit` appears exactly `count` times in the grid
+        self.grid = {
+            digit: {int(count): self._pack(frequencies[:, digit - 1] == count)
+                    for count in np.unique(frequencies[:, digit - 1])}
+            for digit in range(1, 10)
+        }
+
+    def _pack(self, mask):
+        return np.packbits(mask)
+
+    def empty(self):
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def full(self):
+        return self._pack(np.ones(self.size, dtype=bool))
+
+    def window(self, first: date, last: date):
+        """
+        Bitmap of the days from `first` to `last`, clipped to the index.
+        """
+        mask = np.zeros(self.size, dtype=bool)
+        lo = max(first.toordinal() - self.start_ordinal, 0)
+        hi = min(last.toordinal() - self.start_ordinal, self.size - 1)
+        if lo <= hi:
+            mask[lo:hi + 1] = True
+        return self._pack(mask)
+
+    def _any_of(self, bitmaps, values):
+        result = self.empty()
+        for value in values:
+            if value in bitmaps:
+                result |= bitmaps[value]
+        return result
+
+    def grid_at_least(self, digit: int, count: int):
+        return self._any_of(self.grid[digit], [c for c in self.grid[digit] if c >= count])
+
+    def grid_at_most(self, digit: int, count: int):
+        return self._any_of(self.grid[digit], [c for c in self.grid[digit] if c <= count])
+
+    def query(self, first: date = None, last: date = None, destiny=(), root=(), grid_min=None, grid_max=None):
+        """
+        Bitmap of the days matching every given condition.
+
+        Args:
+        - first, last (date): Restrict to this window of days
+        - destiny, root (iterable of int): Any of these numbers (empty means any)
+        - grid_min, grid_max (dict): digit -> minimum / maximum count in the grid
+        """
+        result = self.window(first or self.start, last or self.end)
+        if destiny:
+            result &= self._any_of(self.destiny, destiny)
+        if root:
+            result &= self._any_of(self.root, root)
+        for digit, count in (grid_min or {}).items():
+            result &= self.grid_at_least(digit, count)
+        for digit, count in (grid_max or {}).items():
+            result &= self.grid_at_most(digit, count)
+        return result
+
+    def count(self, bitmap) -> int:
+        return int(np.unpackbits(bitmap, count=self.size).sum())
+
+    def positions(self, bitmap, after: date = None, limit: int = None):
+        """
+        Offsets (from `start`) of the days set in `bitmap`, after the given date, at most `limit`.
+        """
+        positions = np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+        if after is not None:
+            positions = positions[np.searchsorted(positions, after.toordinal() - self.start_ordinal, side="right"):]
+        if limit is not None:
+            positions = positions[:limit]
+        return positions
+
+    def entries(self, positions):
+        """
+        Result rows for day offsets returned by `positions`.
+        """
+        destiny_numbers = self.destiny_numbers[positions].tolist()
+        root_numbers = self.root_numbers[positions].tolist()
+        for position, destiny, root in zip(positions.tolist(), destiny_numbers, root_numbers):
+            yield {
+                "date": date.fromordinal(self.start_ordinal + position).isoformat(),
+                "destiny_number": destiny,
+                "root_number": root,
+            }
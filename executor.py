@@ -0,0 +1,108 @@
+"""
+Execution layer that keeps CPU-bound work off the event loop.
+
+Work runs on a thread or process pool behind a concurrency limit and a
+bounded queue; when both are full `Saturated` is raised so the app can answer
+503 instead of letting latency grow without bound. Calls that share a key
+while one is in flight are coalesced into a single computation.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+MODES = ("inline", "thread", "process")
+
+
+class Saturated(Exception):
+    """
+    Raised when the executor already has as much work as it will accept.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many requests in progress")
+        self.retry_after = retry_after
+
+
+class ComputeExecutor:
+    """
+    Run functions with at most `max_concurrency` at once and `max_queue` more waiting.
+
+    `mode` is "thread" or "process" for a pool of `max_workers`, or "inline"
+    to run on the event loop as before (useful as a baseline).
+    """
+
+    def __init__(self, mode: str = "thread", max_workers: int = 4, max_concurrency: int = None,
+                 max_queue: int = 64, retry_after: int = 1):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool = None
+        self._semaphore = None
+        self._admitted = 0
+        self._inflight = {}
+        self.coalesced = 0
+        self.rejected = 0
+
+    @property
+    def admitted(self):
+        """Calls currently running or waiting for a slot."""
+        return self._admitted
+
+    def _get_pool(self):
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            elif self.mode == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="numero")
+        return self._pool
+
+    async def _execute(self, func, args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            if self.mode == "inline":
+                return func(*args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), partial(func, *args))
+
+    def _release(self, task):
+        self._admitted -= 1
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away
+            task.exception()
+
+    async def run(self, func, *args, key=None):
+        """
+        Run `func(*args)` off the event loop and return its result.
+
+        Concurrent calls with the same non-None `key` share one computation.
+        Raises Saturated when the concurrency limit and queue are both full.
+        """
+        if key is not None and key in self._inflight:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight[key])
+
+        if self._admitted >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            raise Saturated(self.retry_after)
+
+        self._admitted += 1
+        task = asyncio.ensure_future(self._execute(func, args))
+        task.add_done_callback(self._release)
+        if key is None:
+            return await task
+
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller going away does not cancel the others
+        return await asyncio.shield(task)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self._semaphore = None
@@ -0,0 +1,92 @@
+"""
+Size-bounded LRU cache of rendered HTML fragments.
+
+The grid and the mahadasha table of the results page depend only on the
+birthdate, so they are rendered once per birthdate and stored alongside a
+deflate segment of their body. The results page is gzipped by concatenating
+the cached segments with segments of the per-request parts
+(`assets.gzip_member`).
+"""
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+from assets import deflate_segment, gzip_member
+
+# Content codings a fragment can be served in
+FRAGMENT_CODINGS = (None, "gzip")
+
+
+class Fragment:
+    __slots__ = ("html", "body", "digest", "deflated", "crc", "size")
+
+    def __init__(self, html: str):
+        self.html = html
+        self.body = html.encode("utf-8")
+        self.digest = hashlib.sha1(self.body).hexdigest()
+        self.deflated = deflate_segment(self.body)
+        self.crc = zlib.crc32(self.body)
+        self.size = len(self.body) + len(self.deflated) + len(html)
+
+    def encoded(self, coding):
+        if coding is None:
+            return self.body
+        return gzip_member([self.deflated], self.crc, len(self.body))
+
+
+class FragmentCache:
+    """
+    Keep rendered fragments until their total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def get(self, kind: str, birthdate: str):
+        """
+        Return the cached Fragment, or None (counted as a miss).
+        """
+        with self._lock:
+            fragment = self._fragments.get((kind, birthdate))
+            if fragment is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._fragments.move_to_end((kind, birthdate))
+            return fragment
+
+    def put(self, kind: str, birthdate: str, fragment: Fragment):
+        with self._lock:
+            previous = self._fragments.pop((kind, birthdate), None)
+            if previous is not None:
+                self.size -= previous.size
+            if fragment.size > self.max_bytes:
+                return
+            self._fragments[(kind, birthdate)] = fragment
+            self.size += fragment.size
+            while self.size > self.max_bytes:
+                _, evicted = self._fragments.popitem(last=False)
+                self.size -= evicted.size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._fragments),
+                "bytes": self.size,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+            self.size = 0
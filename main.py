@@ -1,284 +1,706 @@
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, Form, Query, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response, FileResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
-from datetime import datetime, timedelta
+from pydantic import BaseModel
+from starlette.requests import ClientDisconnect
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+import hashlib
+import io
 import os
-import itertools
 import json
+import re
+import time
+import uuid
+import zlib
+
+from numerology import (
+    calculate_destiny_number,
+    calculate_root_number,
+    calculate_chaldean_number,
+    generate_vedic_grid_dynamic,
+    calculate_mahadasha_antardasha,
+    update_vedic_grid,
+)
+from assets import PrecompressedStaticFiles, deflate_segment, encoded_etag, gzip_member, negotiate_encoding
+import batch
+import birthtable
+import bulk
+from dateindex import DateIndex
+from executor import ComputeExecutor, Saturated
+from fragments import FRAGMENT_CODINGS, Fragment, FragmentCache
+import metrics
+from metrics import timed
+from names import CHALDEAN_NUMBERS, NameIndex, spelling_variants
+import pratyantar
+from reportcache import ReportCache
+from timeline import iter_timeline
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BIRTH_TABLE_PATH = os.environ.get(
+    "NUMERO_BIRTH_TABLE", os.path.join(BASE_DIR, "data", "birthdate_table.bin")
+)
+
+NAME_DICT_PATH = os.environ.get("NUMERO_NAME_DICT", os.path.join(BASE_DIR, "data", "names.txt"))
+
+# Span of days covered by the reverse date index
+DATE_INDEX_START = date.fromisoformat(os.environ.get("NUMERO_DATE_INDEX_START", "1900-01-01"))
+DATE_INDEX_END = date.fromisoformat(os.environ.get("NUMERO_DATE_INDEX_END", "2100-12-31"))
+
+REPORT_CACHE_SIZE = int(os.environ.get("NUMERO_REPORT_CACHE_SIZE", "1024"))
+REPORT_CACHE_TTL = int(os.environ.get("NUMERO_REPORT_CACHE_TTL", "3600"))
+FRAGMENT_CACHE_BYTES = int(os.environ.get("NUMERO_FRAGMENT_CACHE_BYTES", str(64 * 1024 * 1024)))
+# Send every year's grid overlay to the page in one payload
+PRECOMPUTE_OVERLAYS = os.environ.get("NUMERO_PRECOMPUTE_OVERLAYS", "0") == "1"
+# Allow starting the sampling profiler through /debug/profiler
+PROFILER_ENABLED = os.environ.get("NUMERO_PROFILER", "0") == "1"
+
+# Where CPU-bound work runs: "thread", "process" or "inline" (on the event loop)
+EXECUTOR_MODE = os.environ.get("NUMERO_EXECUTOR", "thread")
+EXECUTOR_WORKERS = int(os.environ.get("NUMERO_EXECUTOR_WORKERS", "4"))
+EXECUTOR_MAX_CONCURRENCY = int(os.environ.get("NUMERO_EXECUTOR_MAX_CONCURRENCY", str(EXECUTOR_WORKERS)))
+EXECUTOR_MAX_QUEUE = int(os.environ.get("NUMERO_EXECUTOR_MAX_QUEUE", "64"))
+EXECUTOR_RETRY_AFTER = int(os.environ.get("NUMERO_EXECUTOR_RETRY_AFTER", "1"))
+
+# Precomputed birthdate table, memory-mapped at startup when available
+birth_table = None
+
+# Name dictionary indexed by Chaldean number, loaded at startup when available
+name_index = None
+
+# Dates by destiny/root number and grid counts, built at startup
+date_index = None
+
+compute = ComputeExecutor(
+    mode=EXECUTOR_MODE,
+    max_workers=EXECUTOR_WORKERS,
+    max_concurrency=EXECUTOR_MAX_CONCURRENCY,
+    max_queue=EXECUTOR_MAX_QUEUE,
+    retry_after=EXECUTOR_RETRY_AFTER,
+)
+
+# Recently computed reports, referenced by the results page through their id
+report_cache = ReportCache(maxsize=REPORT_CACHE_SIZE, ttl=REPORT_CACHE_TTL)
+
+# Rendered birthdate-only blocks of the results page
+fragment_cache = FragmentCache(max_bytes=FRAGMENT_CACHE_BYTES)
+FRAGMENT_TEMPLATES = {
+    "vedic_grid": "fragments/vedic_grid.html",
+    "mahadasha_rows": "fragments/mahadasha_rows.html",
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global birth_table, name_index, date_index
+    birth_table = birthtable.open_table(BIRTH_TABLE_PATH)
+    if os.path.exists(NAME_DICT_PATH):
+        name_index = NameIndex.from_file(NAME_DICT_PATH)
+    date_index = DateIndex(DATE_INDEX_START, DATE_INDEX_END)
+    yield
+    date_index = None
+    name_index = None
+    compute.shutdown()
+    bulk.shutdown_executor()
+    if birth_table is not None:
+        birth_table.close()
+        birth_table = None
+
 
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(metrics.TimingMiddleware)
+profiler = metrics.SamplingProfiler()
 
 # Set up templates and static files
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
-app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), name="static")
+static_files = PrecompressedStaticFiles(directory=os.path.join(BASE_DIR, "static"))
+templates.env.globals["static_url"] = static_files.url
+app.mount("/static", static_files, name="static")
 
 
-def calculate_destiny_number(birthdate: str) -> int:
-    """
-    Calculate the Destiny Number (Life Path Number) from a given birthdate.
-    
-    Args:
-    - birthdate (str): Birthdate in the format 'YYYY-MM-DD'
-    
-    Returns:
-    - int: The Destiny (Life Path) number
-    """
-    # Split the birthdate into year, month, and day
-    year, month, day = map(int, birthdate.split('-'))
-    
-    # Reduce the components to a single digit (or Master Number)
-    def reduce_to_single_digit(number):
-        while number > 9 and number not in [11, 22, 33]:  # Master Numbers
-            number = sum(int(digit) for digit in str(number))
-        return number
-    
-    # Calculate life path by summing year, month, and day
-    year_sum = reduce_to_single_digit(year)
-    month_sum = reduce_to_single_digit(month)
-    day_sum = reduce_to_single_digit(day)
-    
-    # Add the sums and reduce again to a single digit
-    total_sum = year_sum + month_sum + day_sum
-    return reduce_to_single_digit(total_sum)
+@app.exception_handler(Saturated)
+async def saturated_handler(request: Request, exc: Saturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# Root route for form submission
+@app.get("/", response_class=HTMLResponse)
+async def get_form(request: Request):
+    return templates.TemplateResponse("index.html", {"request": request})
 
 
-def calculate_root_number(birthdate: str) -> int:
+def birthdate_report(birthdate: str):
     """
-    Calculate the Root Number from the given birthdate's day (DD).
-    
-    Args:
-    - birthdate (str): Birthdate in the format 'YYYY-MM-DD'
-    
-    Returns:
-    - int: The Root Number (based on the day of birth)
+    Collect every result that depends only on the birthdate.
+
+    Served from the precomputed birthdate table when it covers the date,
+    otherwise calculated on the spot.
     """
-    # Extract the day (DD) from the birthdate
-    day = int(birthdate.split('-')[2])
-    
-    # Sum the digits of the day
-    total_sum = sum(int(digit) for digit in str(day))
-    
-    # Reduce the sum to a single digit (or Master Number)
-    def reduce_to_single_digit(number):
-        while number > 9 and number not in [11, 22, 33]:  # Master Numbers
-            number = sum(int(digit) for digit in str(number))
-        return number
-    
-    return reduce_to_single_digit(total_sum)
-
-
-# Chaldean Numerology Calculation
-def calculate_chaldean_number(name: str) -> int:
-    chaldean_chart = {
-        "A": 1, "I": 1, "J": 1, "Q": 1, "Y": 1,
-        "B": 2, "K": 2, "R": 2,
-        "C": 3, "G": 3, "L": 3, "S": 3,
-        "D": 4, "M": 4, "T": 4,
-        "E": 5, "H": 5, "N": 5, "X": 5,
-        "U": 6, "V": 6, "W": 6,
-        "O": 7, "Z": 7,
-        "F": 8, "P": 8
+    if birth_table is not None:
+        with timed("birth_table"):
+            report = birth_table.report(birthdate)
+        if report is not None:
+            return report
+
+    with timed("destiny_number"):
+        destiny_number = calculate_destiny_number(birthdate)
+    with timed("root_number"):
+        root_number = calculate_root_number(birthdate)
+    with timed("vedic_grid"):
+        vedic_grid = generate_vedic_grid_dynamic(birthdate)
+    with timed("mahadasha"):
+        mahadasha_periods = calculate_mahadasha_antardasha(birthdate)
+    return {
+        "destiny_number": destiny_number,
+        "root_number": root_number,
+        "vedic_grid": vedic_grid,
+        "mahadasha_periods": mahadasha_periods,
     }
-    name = name.upper().replace(" ", "")
-    name_sum = sum(chaldean_chart.get(char, 0) for char in name if char in chaldean_chart)
-    while name_sum > 9 and name_sum not in {11, 22}:
-        name_sum = sum(int(digit) for digit in str(name_sum))
-    return name_sum
-
-# Predefined 3x3 grid layout
-VEDIC_MATRIX = [
-    [3, 1, 9],
-    [6, 7, 5],
-    [2, 8, 4]
-]
-
-def generate_vedic_grid_dynamic(birthdate: str):
-    """
-    Generate a 3x3 Vedic numerology grid where numbers appear based on their frequency in the DOB.
-    """
-    # Flatten the predefined grid to validate positions
-    flat_matrix = list(itertools.chain(*VEDIC_MATRIX))
 
-    # Count occurrences of each number in the DOB
-    dob_digits = [int(digit) for digit in birthdate if digit.isdigit()]
-    dob_digits.append(calculate_destiny_number(birthdate))  # Add Destiny Number
-    
-    day = int(birthdate.split('-')[2])
-    if day > 9 and day not in [10, 20, 30]:
-        dob_digits.append(calculate_root_number(birthdate))  # Add Root Number
-
-    # remove first 2 digits
-    dob_digits = dob_digits[2:]
-    frequency = {num: dob_digits.count(num) for num in range(1, 10)}
-
-    # Generate the grid with counts
-    grid = []
-    for row in VEDIC_MATRIX:
-        grid_row = []
-        for num in row:
-            grid_row.append(str(num) * frequency[num])  # Repeat the number based on its frequency
-        grid.append(grid_row)
-
-    return grid
-
-def calculate_mahadasha_antardasha(birthdate: str, num_years: int = 90):
-    birthdate_dt = datetime.strptime(birthdate, "%Y-%m-%d")
-    day, month, year = birthdate_dt.day, birthdate_dt.month, birthdate_dt.year
-    root_number = sum(int(digit) for digit in str(day))
-    while root_number > 9:
-        root_number = sum(int(digit) for digit in str(root_number))
-
-    mahadasha_order = []
-    start = root_number
-    for _ in range(9):  # One cycle
-        mahadasha_order.append(start)
-        start += 1
-        if start > 9:
-            start = 1
 
-    results = []
-    current_year = year
-    mahadasha_index = 0
-    mahadasha_start_year = year
-
-    for i in range(num_years):
-        current_birthday = datetime(current_year + i, month, day)
-        if current_year + i >= mahadasha_start_year + mahadasha_order[mahadasha_index]:
-            mahadasha_index = (mahadasha_index + 1) % len(mahadasha_order)
-            mahadasha_start_year = current_year + i
-
-        mahadasha = mahadasha_order[mahadasha_index]
-        sum_dob = day + month + (current_year + i) % 100
-        weekday = current_birthday.weekday()
-        weekday_map = {0: 2, 1: 9, 2: 5, 3: 3, 4: 6, 5: 8, 6: 1}
-        sum_dob += weekday_map[weekday]
-        while sum_dob > 9:
-            sum_dob = sum(int(digit) for digit in str(sum_dob))
-        antardasha = sum_dob
-        running_age = (current_year + i) - year + 1
-        results.append({
-            "year": current_year + i,
-            "start_date": current_birthday.strftime("%d-%m-%Y"),
-            "running_age": running_age,
-            "mahadasha": mahadasha,
-            "antardasha": antardasha,
-        })
+def render_fragment(kind: str, report):
+    with timed("render_fragment"):
+        return Fragment(templates.get_template(FRAGMENT_TEMPLATES[kind]).render(results=report))
 
-    return results
 
+# Marks where each fragment goes in the rendered page. User input is
+# autoescaped by the template, so it cannot produce a placeholder.
+FRAGMENT_PLACEHOLDER = "<!--fragment:{}-->"
+FRAGMENT_PLACEHOLDER_PATTERN = re.compile(r"<!--fragment:(\w+)-->")
 
-# Root route for form submission
-@app.get("/", response_class=HTMLResponse)
-async def get_form(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+
+def render_result_page(results, fragments, coding=None):
+    """
+    Render the results page around cached fragments, as bytes in `coding` (None or "gzip").
+
+    Only the text between the fragments is encoded and compressed per
+    request; the fragments' own deflate segments are reused.
+    """
+    with timed("render_page"):
+        placeholders = {kind: FRAGMENT_PLACEHOLDER.format(kind) for kind in fragments}
+        page = templates.get_template("index.html").render(results={**results, "fragments": placeholders})
+
+        bodies = []
+        segments = []
+        # split() alternates page text and the fragment kinds captured between it
+        for index, part in enumerate(FRAGMENT_PLACEHOLDER_PATTERN.split(page)):
+            if index % 2:
+                bodies.append(fragments[part].body)
+                segments.append(fragments[part].deflated)
+            else:
+                body = part.encode("utf-8")
+                bodies.append(body)
+                if coding is not None:
+                    segments.append(deflate_segment(body))
+
+        if coding is None:
+            return b"".join(bodies)
+        crc = 0
+        for body in bodies:
+            crc = zlib.crc32(body, crc)
+        return gzip_member(segments, crc, sum(len(body) for body in bodies))
+
+
+def observe_request_parsing(request: Request):
+    # Time between the request arriving and the handler starting: routing and body parsing
+    received_at = getattr(request.state, "received_at", None)
+    if received_at is not None:
+        metrics.STAGE_SECONDS.observe("parse_request", time.perf_counter() - received_at)
+
+
+async def get_cached_report(birthdate: str):
+    cached = report_cache.lookup(birthdate)
+    if cached is None:
+        # Concurrent requests for the same birthdate share one computation
+        report = await compute.run(birthdate_report, birthdate, key=("report", birthdate))
+        cached = report_cache.put(birthdate, report)
+    return cached
+
+
+async def get_fragment(kind: str, birthdate: str, report):
+    fragment = fragment_cache.get(kind, birthdate)
+    if fragment is None:
+        fragment = await compute.run(render_fragment, kind, report, key=("fragment", kind, birthdate))
+        fragment_cache.put(kind, birthdate, fragment)
+    return fragment
 
 
 @app.post("/result", response_class=HTMLResponse)
 async def post_result(request: Request, name: str = Form(...), birthdate: str = Form(...)):
-    chaldean_number = calculate_chaldean_number(name)
-    vedic_grid = generate_vedic_grid_dynamic(birthdate)
-    mahadasha_periods = calculate_mahadasha_antardasha(birthdate)
-    destiny_number = calculate_destiny_number(birthdate)
-    root_number = calculate_root_number(birthdate)
-    
-    return templates.TemplateResponse(
-        "index.html",
+    observe_request_parsing(request)
+    with timed("chaldean_number"):
+        chaldean_number = calculate_chaldean_number(name)
+    cached = await get_cached_report(birthdate)
+    report = cached.report
+    fragments = {}
+    for kind in FRAGMENT_TEMPLATES:
+        fragments[kind] = await get_fragment(kind, birthdate, report)
+
+    coding = negotiate_encoding(request.headers.get("accept-encoding", ""), FRAGMENT_CODINGS)
+    body = await compute.run(
+        render_result_page,
         {
-            "request": request,
-            "results": {
-                "name": name,
-                "birthdate": datetime.strptime(birthdate, "%Y-%m-%d").strftime("%d-%m-%Y"),
-                "chaldean_number": chaldean_number,
-                "destiny_number": destiny_number,
-                "root_number": root_number,
-                "vedic_grid": vedic_grid,
-                "grid_layout": VEDIC_MATRIX,  # Original matrix for subscripts
-                "mahadasha_periods": mahadasha_periods,
-            },
+            "name": name,
+            "birthdate": datetime.strptime(birthdate, "%Y-%m-%d").strftime("%d-%m-%Y"),
+            "chaldean_number": chaldean_number,
+            "destiny_number": report["destiny_number"],
+            "root_number": report["root_number"],
+            "report_id": cached.report_id,
+            "precompute_overlays": PRECOMPUTE_OVERLAYS,
         },
+        fragments,
+        coding,
     )
+    headers = {"Vary": "Accept-Encoding"}
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return HTMLResponse(body, headers=headers)
+
+
+# Birthdate-only blocks of the results page, precompressed
+@app.get("/fragments/{kind}")
+async def get_fragment_html(request: Request, kind: str, birthdate: str):
+    if kind not in FRAGMENT_TEMPLATES:
+        raise HTTPException(status_code=404, detail="Unknown fragment")
+    if birthtable.birthdate_ordinal(birthdate) is None:
+        raise HTTPException(status_code=422, detail="Birthdate must be a valid date in the format YYYY-MM-DD")
+
+    cached = await get_cached_report(birthdate)
+    fragment = await get_fragment(kind, birthdate, cached.report)
+
+    coding = negotiate_encoding(request.headers.get("accept-encoding", ""), FRAGMENT_CODINGS)
+    headers = {
+        "ETag": encoded_etag(fragment.digest, coding),
+        "Cache-Control": f"private, max-age={REPORT_CACHE_TTL}",
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=fragment.encoded(coding), media_type="text/html", headers=headers)
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    return {
+        "fragments": fragment_cache.stats(),
+        "reports": {"entries": len(report_cache)},
+    }
 
-# Function to check if a given year is a leap year
-def is_leap_year(year):
-    if (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0):
-        return True
-    else:
-        return False
-
-# Function to update the grid based on Mahadasha and Antardasha
-def update_vedic_grid(base_grid, mahadasha, antardasha, start_date):
-    # Create a new updated grid
-    updated_grid = []
-
-    for row_index, row in enumerate(VEDIC_MATRIX):  # Iterate through the original Vedic matrix
-        updated_row = []
-        for col_index, cell in enumerate(row):
-            # Get the current cell value from the base grid
-            current_value = base_grid[row_index][col_index]
-
-            # Append Mahadasha or Antardasha if the position matches
-            if cell == mahadasha:
-                current_value += '[' + str(mahadasha) + ']'
-            if cell == antardasha:
-                current_value += '(' + str(antardasha) + ')'
-
-            updated_row.append(current_value)
-        updated_grid.append(updated_row)
-
-    date_ranges = []
-    current_date = datetime.strptime(start_date, "%d-%m-%Y")
-
-    # Check if the current year is a leap year
-    leap_year_bool = False
-    if current_date.month <= 2:
-        leap_year_bool = is_leap_year(current_date.year)
-    else:
-        leap_year_bool = is_leap_year(current_date.year + 1)
 
-    # Calculate the multiplication factor based on leap year
-    if leap_year_bool:
-        mul_factor = 8.13
-    else:
-        mul_factor = 8.11
-
-    for number in range(antardasha, 10):
-        days = round(number * mul_factor)
-        end_date = current_date + timedelta(days=days-1)
-        date_ranges.append({
-            "start_date": current_date.strftime("%d-%m-%Y"),
-            "end_date": end_date.strftime("%d-%m-%Y"),
-            "number": number
-        })
-        current_date = end_date + timedelta(days=1)
-    
-    for number in range(1, antardasha):
-        days = round(number * mul_factor)
-        end_date = current_date + timedelta(days=days-1)
-        date_ranges.append({
-            "start_date": current_date.strftime("%d-%m-%Y"),
-            "end_date": end_date.strftime("%d-%m-%Y"),
-            "number": number
+def year_overlays(report):
+    """
+    Grid overlay and sub-period date ranges for every year of the report's timeline.
+    """
+    overlays = []
+    for period in report["mahadasha_periods"]:
+        (updated_grid, date_ranges) = update_vedic_grid(
+            report["vedic_grid"], period["mahadasha"], period["antardasha"], period["start_date"]
+        )
+        overlays.append({
+            "year": period["year"],
+            "start_date": period["start_date"],
+            "mahadasha": period["mahadasha"],
+            "antardasha": period["antardasha"],
+            "updated_grid": updated_grid,
+            "date_ranges": date_ranges,
         })
-        current_date = end_date + timedelta(days=1)
-    
-    return (updated_grid, date_ranges)
+    return overlays
+
+
+def cacheable_json_response(request: Request, content):
+    """
+    JSON response with an ETag, answering 304 when the client already has it.
+    """
+    body = json.dumps(content, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={REPORT_CACHE_TTL}"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 # Add endpoint for dynamically updating grid based on Mahadasha and Antardasha
 @app.get("/update-grid")
 async def update_grid(
-    mahadasha: int, 
-    antardasha: int,
-    start_date: str,
-    base_grid: str
+    request: Request,
+    mahadasha: int = None,
+    antardasha: int = None,
+    start_date: str = None,
+    base_grid: str = None,
+    report_id: str = None,
+    all_years: bool = Query(False, alias="all"),
 ):
-    # Convert the base grid from JSON string to Python list
-    base_grid = json.loads(base_grid)
-    
-    # Define your updated grid logic here
-    (updated_grid, date_ranges) = update_vedic_grid(base_grid, mahadasha, antardasha, start_date)
+    observe_request_parsing(request)
+    if report_id is not None:
+        cached = report_cache.get(report_id)
+        if cached is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired report id")
+
+        # Every year of the timeline in one payload
+        if all_years:
+            if cached.overlays is None:
+                cached.overlays = await compute.run(
+                    metrics.timed_call, "year_overlays", year_overlays, cached.report,
+                    key=("overlays", cached.report_id),
+                )
+            return cacheable_json_response(request, {"overlays": cached.overlays})
+
+        base_grid = cached.report["vedic_grid"]
+    elif base_grid is not None:
+        # Convert the base grid from JSON string to Python list
+        base_grid = json.loads(base_grid)
+    else:
+        raise HTTPException(status_code=422, detail="Either report_id or base_grid is required")
+
+    if mahadasha is None or antardasha is None or start_date is None:
+        raise HTTPException(status_code=422, detail="mahadasha, antardasha and start_date are required")
+
+    (updated_grid, date_ranges) = await compute.run(
+        metrics.timed_call, "update_vedic_grid", update_vedic_grid, base_grid, mahadasha, antardasha, start_date
+    )
     
     # Return updated grid as JSON response
-    return JSONResponse(content={"updated_grid": updated_grid, "date_ranges": date_ranges})
+    return cacheable_json_response(request, {"updated_grid": updated_grid, "date_ranges": date_ranges})
+
+
+class BatchRecord(BaseModel):
+    name: str
+    birthdate: str
+
+
+class BatchReportRequest(BaseModel):
+    records: list[BatchRecord]
+
+
+def batch_results(names, birthdates):
+    report = batch.batch_report(names, birthdates)
+
+    chaldean_numbers = report["chaldean_number"].tolist()
+    destiny_numbers = report["destiny_number"].tolist()
+    root_numbers = report["root_number"].tolist()
+    vedic_grids = batch.vedic_grid_strings(report["grid_counts"])
+
+    results = []
+    errors = []
+    for index, is_valid in enumerate(report["valid"].tolist()):
+        if not is_valid:
+            errors.append({
+                "index": index,
+                "birthdate": birthdates[index],
+                "error": "Birthdate must be a valid date in the format YYYY-MM-DD",
+            })
+            continue
+        results.append({
+            "index": index,
+            "name": names[index],
+            "birthdate": birthdates[index],
+            "chaldean_number": chaldean_numbers[index],
+            "destiny_number": destiny_numbers[index],
+            "root_number": root_numbers[index],
+            "vedic_grid": vedic_grids[index],
+        })
+
+    return {"results": results, "errors": errors}
+
+
+# Batch endpoint for scoring whole cohorts in one request
+@app.post("/api/report/batch")
+async def post_batch_report(payload: BatchReportRequest):
+    names = [record.name for record in payload.records]
+    birthdates = [record.birthdate for record in payload.records]
+    return JSONResponse(content=await compute.run(batch_results, names, birthdates))
+
+
+# Rows serialized per chunk of streamed NDJSON responses
+NDJSON_CHUNK_ROWS = 256
+
+
+def ndjson_chunks(rows):
+    """
+    Serialize rows as NDJSON, NDJSON_CHUNK_ROWS rows per yielded chunk.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(row))
+        if len(chunk) == NDJSON_CHUNK_ROWS:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+# Stream any window of the Mahadasha/Antardasha timeline as NDJSON
+@app.get("/api/timeline")
+async def get_timeline(
+    birthdate: str,
+    from_year: int = Query(None, alias="from"),
+    to_year: int = Query(None, alias="to"),
+):
+    from_year, to_year = parse_timeline_window(birthdate, from_year, to_year, 9999)
+    rows = iter_timeline(birthdate, from_year, to_year)
+    return StreamingResponse(ndjson_chunks(rows), media_type="application/x-ndjson")
+
+
+def parse_timeline_birthdate(birthdate: str):
+    try:
+        birthdate_dt = datetime.strptime(birthdate, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Birthdate must be a valid date in the format YYYY-MM-DD")
+    if birthdate_dt.month == 2 and birthdate_dt.day == 29:
+        raise HTTPException(status_code=422, detail="The timeline is not defined for February 29 birthdates")
+    return birthdate_dt
+
+
+def parse_timeline_window(birthdate: str, from_year, to_year, max_year: int):
+    """
+    Validate a timeline window, defaulting to 90 years from the birth year.
+    """
+    birthdate_dt = parse_timeline_birthdate(birthdate)
+    if from_year is None:
+        from_year = birthdate_dt.year
+    if to_year is None:
+        to_year = from_year + 89
+    if not birthdate_dt.year <= from_year <= to_year <= max_year:
+        raise HTTPException(status_code=422, detail=f"Expected birth year <= from <= to <= {max_year}")
+    return from_year, to_year
+
+
+def check_output_format(output: str):
+    if output not in ("json", "ndjson"):
+        raise HTTPException(status_code=422, detail="output must be json or ndjson")
+
+
+def pratyantar_rows(birthdate, from_year, to_year):
+    return list(pratyantar.PratyantarCalendar(birthdate, from_year, to_year).rows())
+
+
+# Every sub-period (the date_ranges of /update-grid) over a window of years
+@app.get("/api/pratyantar")
+async def get_pratyantar(
+    birthdate: str,
+    from_year: int = Query(None, alias="from"),
+    to_year: int = Query(None, alias="to"),
+    output: str = "json",
+):
+    from_year, to_year = parse_timeline_window(birthdate, from_year, to_year, pratyantar.MAX_YEAR)
+    check_output_format(output)
+    if output == "ndjson":
+        rows = pratyantar.PratyantarCalendar(birthdate, from_year, to_year).rows()
+        return StreamingResponse(ndjson_chunks(rows), media_type="application/x-ndjson")
+    rows = await compute.run(pratyantar_rows, birthdate, from_year, to_year, key=("pratyantar", birthdate, from_year, to_year))
+    return JSONResponse(content={"birthdate": birthdate, "periods": rows})
+
+
+class ActivePeriodsRequest(BaseModel):
+    birthdate: str
+    dates: list[str]
+
+
+# The sub-period active on each of many dates
+@app.post("/api/pratyantar/active")
+async def post_pratyantar_active(payload: ActivePeriodsRequest, output: str = "json"):
+    birthdate_dt = parse_timeline_birthdate(payload.birthdate)
+    if birthdate_dt.year > pratyantar.MAX_YEAR:
+        raise HTTPException(status_code=422, detail=f"Expected birth year <= {pratyantar.MAX_YEAR}")
+    check_output_format(output)
+    results = await compute.run(pratyantar.active_periods, payload.birthdate, payload.dates)
+    if output == "ndjson":
+        return StreamingResponse(ndjson_chunks(results), media_type="application/x-ndjson")
+    return JSONResponse(content={"birthdate": payload.birthdate, "results": results})
+
+
+# Upload a CSV with name and birthdate columns and stream back the scored rows
+@app.post("/api/bulk")
+async def post_bulk(request: Request, output: str = "csv"):
+    if output not in bulk.OUTPUT_FORMATS:
+        raise HTTPException(status_code=422, detail=f"output must be one of {', '.join(bulk.OUTPUT_FORMATS)}")
+
+    # Read the body as it arrives rather than as an UploadFile, which is
+    # spooled to a temporary file before the handler runs
+    upload = bulk.UploadStream(request.stream(), request.headers.get("content-type"))
+    if not await upload.find_file():
+        raise HTTPException(status_code=422, detail="Expected a text/csv body or a CSV upload in the 'file' field")
+
+    bulk.remove_stale_error_streams()
+    job_id = uuid.uuid4().hex
+
+    def body():
+        try:
+            yield from bulk.stream_job(io.BufferedReader(upload), output, job_id)
+        except ClientDisconnect:
+            pass
+
+    return bulk.UploadStreamingResponse(
+        body(),
+        upload,
+        media_type="text/csv" if output == "csv" else "application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="numerology-{job_id}.{output}"',
+            "X-Bulk-Job-Id": job_id,
+            "Link": f'</api/bulk/{job_id}/errors>; rel="errors"',
+        },
+    )
+
+
+# Per-row errors of a bulk job, as NDJSON
+@app.get("/api/bulk/{job_id}/errors")
+async def get_bulk_errors(job_id: str):
+    path = bulk.error_stream_path(job_id)
+    if not re.fullmatch(r"[0-9a-f]{32}", job_id) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Unknown bulk job")
+    return FileResponse(path, media_type="application/x-ndjson")
+
+
+def check_chaldean_number(target):
+    if target is not None and target not in CHALDEAN_NUMBERS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"target must be one of {', '.join(map(str, CHALDEAN_NUMBERS))}",
+        )
+
+
+# Names from the dictionary with a given Chaldean number
+@app.get("/api/names/suggest")
+async def get_name_suggestions(target: int, prefix: str = "", limit: int = Query(20, ge=1, le=1000)):
+    check_chaldean_number(target)
+    if name_index is None:
+        raise HTTPException(status_code=503, detail="No name dictionary is loaded")
+    return {
+        "target": target,
+        "prefix": prefix,
+        "total": name_index.count(target),
+        "names": name_index.suggest(target, prefix, limit),
+    }
+
+
+# One-letter spelling variants of a name, optionally only those with a given Chaldean number
+@app.get("/api/names/variants")
+async def get_name_variants(name: str = Query(..., max_length=200), target: int = None):
+    check_chaldean_number(target)
+    return {
+        "name": name,
+        "chaldean_number": calculate_chaldean_number(name),
+        "variants": await compute.run(spelling_variants, name, target),
+    }
+
+
+def parse_query_date(value: str, field: str):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{field} must be a date in the format YYYY-MM-DD")
+
+
+def parse_grid_conditions(conditions, field: str, combine):
+    """
+    Parse repeated 'digit:count' query values into a {digit: count} dict.
+
+    Counts given more than once for a digit are merged with `combine`: max
+    for minimums and min for maximums, the tighter bound of the two.
+    """
+    parsed = {}
+    for condition in conditions:
+        digit, _, count = condition.partition(":")
+        if not (digit.isdigit() and count.isdigit() and 1 <= int(digit) <= 9):
+            raise HTTPException(status_code=422, detail=f"{field} values must look like 'digit:count', e.g. 5:0")
+        digit, count = int(digit), int(count)
+        parsed[digit] = combine(parsed[digit], count) if digit in parsed else count
+    return parsed
+
+
+def date_search_page(bitmap, after, limit):
+    positions = date_index.positions(bitmap, after=after, limit=limit + 1)
+    entries = list(date_index.entries(positions[:limit]))
+    return {
+        "count": date_index.count(bitmap),
+        "dates": entries,
+        "next_cursor": entries[-1]["date"] if len(positions) > limit else None,
+    }
+
+
+# Dates whose destiny/root numbers and grid match every condition
+@app.get("/api/dates/search")
+async def search_dates(
+    from_date: str = Query(None, alias="from"),
+    to_date: str = Query(None, alias="to"),
+    destiny: list[int] = Query([]),
+    root: list[int] = Query([]),
+    grid_min: list[str] = Query([]),
+    grid_max: list[str] = Query([]),
+    cursor: str = None,
+    limit: int = Query(100, ge=1, le=10000),
+    output: str = "json",
+):
+    first = parse_query_date(from_date, "from") if from_date is not None else date_index.start
+    last = parse_query_date(to_date, "to") if to_date is not None else date_index.end
+    if not date_index.start <= first <= last <= date_index.end:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Expected {date_index.start.isoformat()} <= from <= to <= {date_index.end.isoformat()}",
+        )
+    check_output_format(output)
+    after = parse_query_date(cursor, "cursor") if cursor is not None else None
+
+    bitmap = date_index.query(
+        first, last,
+        destiny=destiny,
+        root=root,
+        grid_min=parse_grid_conditions(grid_min, "grid_min", max),
+        grid_max=parse_grid_conditions(grid_max, "grid_max", min),
+    )
+    if output == "ndjson":
+        rows = date_index.entries(date_index.positions(bitmap, after=after))
+        return StreamingResponse(ndjson_chunks(rows), media_type="application/x-ndjson")
+    return await compute.run(date_search_page, bitmap, after, limit)
+
+
+# Prometheus metrics: stage and request histograms plus cache and executor counters
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    fragment_stats = fragment_cache.stats()
+    sections = [
+        metrics.STAGE_SECONDS.render(),
+        metrics.REQUEST_SECONDS.render(),
+        metrics.render_sample("numero_fragment_cache_hits_total", "Fragment cache hits.", "counter", fragment_stats["hits"]),
+        metrics.render_sample("numero_fragment_cache_misses_total", "Fragment cache misses.", "counter", fragment_stats["misses"]),
+        metrics.render_sample("numero_fragment_cache_bytes", "Bytes held by the fragment cache.", "gauge", fragment_stats["bytes"]),
+        metrics.render_sample("numero_report_cache_entries", "Reports held by the report cache.", "gauge", len(report_cache)),
+        metrics.render_sample("numero_executor_admitted", "Calls running or queued on the executor.", "gauge", compute.admitted),
+        metrics.render_sample("numero_executor_coalesced_total", "Calls that joined an in-flight computation.", "counter", compute.coalesced),
+        metrics.render_sample("numero_executor_rejected_total", "Calls rejected with 503.", "counter", compute.rejected),
+    ]
+    return "\n".join(sections) + "\n"
+
+
+def check_profiler_enabled():
+    if not PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+# Start or stop the sampling profiler (only with NUMERO_PROFILER=1)
+@app.post("/debug/profiler")
+async def toggle_profiler(enabled: bool, reset: bool = False):
+    check_profiler_enabled()
+    if reset:
+        profiler.clear()
+    if enabled:
+        profiler.start()
+    else:
+        profiler.stop()
+    return {"running": profiler.running, "stacks": len(profiler.samples)}
+
+
+# Collapsed stacks collected so far, ready for flamegraph tools
+@app.get("/debug/profiler", response_class=PlainTextResponse)
+async def get_profile():
+    check_profiler_enabled()
+    return profiler.collapsed() + "\n"
@@ -0,0 +1,175 @@
+"""
+Lightweight timing instrumentation exposed in the Prometheus text format.
+
+Stages are timed with `timed("stage")` into the `numero_stage_seconds`
+histogram and whole requests by `TimingMiddleware`. Timings recorded in
+process-pool workers stay in those processes, so run with a thread executor
+to see per-stage timings of offloaded work.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_value(value):
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram keyed by the value of one label.
+    """
+
+    def __init__(self, name: str, documentation: str, label: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[index] += 1
+                    break
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, [list(value[0]), value[1], value[2]]) for key, value in self._series.items())
+        for label_value, (counts, total, count) in series:
+            label = f'{self.label}="{_escape(label_value)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{_format_value(bound)}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total!r}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return "\n".join(lines)
+
+
+STAGE_SECONDS = Histogram("numero_stage_seconds", "Time spent in each stage of a request.", "stage")
+REQUEST_SECONDS = Histogram("numero_request_seconds", "Time to serve a request, by route.", "route")
+
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(stage, time.perf_counter() - start)
+
+
+def timed_call(stage: str, func, *args):
+    """
+    Call `func(*args)` under `timed(stage)`; picklable, so it can be sent to an executor.
+    """
+    with timed(stage):
+        return func(*args)
+
+
+def render_sample(name: str, documentation: str, metric_type: str, value):
+    """
+    Exposition lines for a single counter or gauge value.
+    """
+    return f"# HELP {name} {documentation}\n# TYPE {name} {metric_type}\n{name} {value}"
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware recording request durations per route template.
+
+    It also stores the time the request arrived in `request.state.received_at`,
+    so handlers can time what happened before they were called (form parsing).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        scope.setdefault("state", {})["received_at"] = start
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                label = route.path
+            elif scope["path"].startswith("/static/"):
+                label = "/static"
+            else:
+                label = "unmatched"
+            REQUEST_SECONDS.observe(label, time.perf_counter() - start)
+
+
+class SamplingProfiler:
+    """
+    Opt-in statistical profiler sampling the stacks of every thread.
+
+    Samples are aggregated as collapsed stacks ("frame;frame;frame count"),
+    the input format of flamegraph tools.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="numero-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def clear(self):
+        self.samples.clear()
@@ -0,0 +1,137 @@
+"""
+Name numerology: find names that produce a given Chaldean number.
+
+`NameIndex` loads a name dictionary once and groups the names by Chaldean
+number, each group sorted by upper-cased name with its letter sums stored
+alongside. A query is then a binary search for the prefix within the target's
+group. `spelling_variants` scores one-letter edits of a name from the name's
+letter sum, adding or removing only the edited letter's value.
+"""
+import logging
+import string
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+from numerology import CHALDEAN_CHART, chaldean_sum, reduce_chaldean_sum
+
+logger = logging.getLogger(__name__)
+
+# Every value calculate_chaldean_number can return
+CHALDEAN_NUMBERS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 22)
+
+reduce_sum = lru_cache(maxsize=None)(reduce_chaldean_sum)
+
+
+class NameIndex:
+    """
+    Names grouped by Chaldean number, sorted for prefix search.
+    """
+
+    def __init__(self, names):
+        groups = {}
+        seen = set()
+        for name in names:
+            name = name.strip()
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            name_sum = chaldean_sum(name)
+            groups.setdefault(reduce_sum(name_sum), []).append((name.upper(), name, name_sum))
+
+        self._keys = {}
+        self._names = {}
+        self._sums = {}
+        for number, entries in groups.items():
+            entries.sort()
+            self._keys[number] = [key for key, _, _ in entries]
+            self._names[number] = [name for _, name, _ in entries]
+            self._sums[number] = array("I", (name_sum for _, _, name_sum in entries))
+        self.size = len(seen)
+
+    @classmethod
+    def from_file(cls, path: str):
+        """
+        Build the index from a UTF-8 text file with one name per line.
+        """
+        with open(path, encoding="utf-8", errors="replace") as names_file:
+            index = cls(names_file)
+        logger.info("Indexed %d names from %s", index.size, path)
+        return index
+
+    def count(self, target: int) -> int:
+        return len(self._keys.get(target, ()))
+
+    def suggest(self, target: int, prefix: str = "", limit: int = 20):
+        """
+        Names with Chaldean number `target` starting with `prefix` (case-insensitive), in alphabetical order.
+        """
+        keys = self._keys.get(target)
+        if not keys:
+            return []
+        prefix = prefix.upper()
+        names = self._names[target]
+        sums = self._sums[target]
+
+        suggestions = []
+        for position in range(bisect_left(keys, prefix), len(keys)):
+            if len(suggestions) == limit or not keys[position].startswith(prefix):
+                break
+            suggestions.append({"name": names[position], "chaldean_number": target, "sum": sums[position]})
+        return suggestions
+
+
+def _cased(letter: str, like: str) -> str:
+    return letter.lower() if like.islower() else letter
+
+
+def spelling_variants(name: str, target: int = None):
+    """
+    Generate every one-letter substitution, insertion and deletion of `name`.
+
+    Each variant is scored from the name's letter sum by removing and adding
+    the values of the edited letters only; pass `target` to keep just the
+    variants with that Chaldean number.
+
+    Returns:
+    - list: dicts with the variant `name`, the `edit` made, its `position`,
+      the letter `sum` and the `chaldean_number`
+    """
+    # Upper-casing works character by character, so letter sums are additive
+    values = [chaldean_sum(char) for char in name]
+    base_sum = sum(values)
+
+    variants = []
+    seen = {name}
+
+    def add(variant, edit, position, variant_sum):
+        if variant in seen:
+            return
+        seen.add(variant)
+        number = reduce_sum(variant_sum)
+        if target is None or number == target:
+            variants.append({
+                "name": variant,
+                "edit": edit,
+                "position": position,
+                "sum": variant_sum,
+                "chaldean_number": number,
+            })
+
+    for position in range(len(name) + 1):
+        neighbour = name[position] if position < len(name) else name[position - 1] if name else "A"
+        for letter in string.ascii_uppercase:
+            letter = _cased(letter, neighbour)
+            add(name[:position] + letter + name[position:], "insert", position,
+                base_sum + CHALDEAN_CHART[letter.upper()])
+
+        if position == len(name) or not name[position].isalpha():
+            continue
+        char = name[position]
+        add(name[:position] + name[position + 1:], "delete", position, base_sum - values[position])
+        for letter in string.ascii_uppercase:
+            letter = _cased(letter, char)
+            add(name[:position] + letter + name[position + 1:], "substitute", position,
+                base_sum - values[position] + CHALDEAN_CHART[letter.upper()])
+
+    return variants
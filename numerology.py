@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta
+import itertools
+
+from timeline import iter_timeline
+
+
+def calculate_destiny_number(birthdate: str) -> int:
+    """
+    Calculate the Destiny Number (Life Path Number) from a given birthdate.
+    
+    Args:
+    - birthdate (str): Birthdate in the format 'YYYY-MM-DD'
+    
+    Returns:
+    - int: The Destiny (Life Path) number
+    """
+    # Split the birthdate into year, month, and day
+    year, month, day = map(int, birthdate.split('-'))
+    
+    # Reduce the components to a single digit (or Master Number)
+    def reduce_to_single_digit(number):
+        while number > 9 and number not in [11, 22, 33]:  # Master Numbers
+            number = sum(int(digit) for digit in str(number))
+        return number
+    
+    # Calculate life path by summing year, month, and day
+    year_sum = reduce_to_single_digit(year)
+    month_sum = reduce_to_single_digit(month)
+    day_sum = reduce_to_single_digit(day)
+    
+    # Add the sums and reduce again to a single digit
+    total_sum = year_sum + month_sum + day_sum
+    return reduce_to_single_digit(total_sum)
+
+
+def calculate_root_number(birthdate: str) -> int:
+    """
+    Calculate the Root Number from the given birthdate's day (DD).
+    
+    Args:
+    - birthdate (str): Birthdate in the format 'YYYY-MM-DD'
+    
+    Returns:
+    - int: The Root Number (based on the day of birth)
+    """
+    # Extract the day (DD) from the birthdate
+    day = int(birthdate.split('-')[2])
+    
+    # Sum the digits of the day
+    total_sum = sum(int(digit) for digit in str(day))
+    
+    # Reduce the sum to a single digit (or Master Number)
+    def reduce_to_single_digit(number):
+        while number > 9 and number not in [11, 22, 33]:  # Master Numbers
+            number = sum(int(digit) for digit in str(number))
+        return number
+    
+    return reduce_to_single_digit(total_sum)
+
+
+# Chaldean letter values
+CHALDEAN_CHART = {
+    "A": 1, "I": 1, "J": 1, "Q": 1, "Y": 1,
+    "B": 2, "K": 2, "R": 2,
+    "C": 3, "G": 3, "L": 3, "S": 3,
+    "D": 4, "M": 4, "T": 4,
+    "E": 5, "H": 5, "N": 5, "X": 5,
+    "U": 6, "V": 6, "W": 6,
+    "O": 7, "Z": 7,
+    "F": 8, "P": 8
+}
+
+# Byte translation table: upper-case ASCII letters to their value, every other byte to 0.
+# Non-ASCII characters only produce UTF-8 bytes >= 0x80, so they score 0 as well.
+CHALDEAN_TABLE = bytes(CHALDEAN_CHART.get(chr(code), 0) for code in range(256))
+
+
+def chaldean_sum(name: str) -> int:
+    """
+    Sum of the Chaldean letter values of a name, before reduction.
+    """
+    return sum(name.upper().encode("utf-8", "surrogatepass").translate(CHALDEAN_TABLE))
+
+
+def reduce_chaldean_sum(name_sum: int) -> int:
+    """
+    Reduce a Chaldean letter sum to a single digit, keeping Master Numbers 11 and 22.
+    """
+    while name_sum > 9 and name_sum not in {11, 22}:
+        name_sum = sum(int(digit) for digit in str(name_sum))
+    return name_sum
+
+
+# Chaldean Numerology Calculation
+def calculate_chaldean_number(name: str) -> int:
+    return reduce_chaldean_sum(chaldean_sum(name))
+
+# Predefined 3x3 grid layout
+VEDIC_MATRIX = [
+    [3, 1, 9],
+    [6, 7, 5],
+    [2, 8, 4]
+]
+
+def generate_vedic_grid_dynamic(birthdate: str):
+    """
+    Generate a 3x3 Vedic numerology grid where numbers appear based on their frequency in the DOB.
+    """
+    # Flatten the predefined grid to validate positions
+    flat_matrix = list(itertools.chain(*VEDIC_MATRIX))
+
+    # Count occurrences of each number in the DOB
+    dob_digits = [int(digit) for digit in birthdate if digit.isdigit()]
+    dob_digits.append(calculate_destiny_number(birthdate))  # Add Destiny Number
+    
+    day = int(birthdate.split('-')[2])
+    if day > 9 and day not in [10, 20, 30]:
+        dob_digits.append(calculate_root_number(birthdate))  # Add Root Number
+
+    # remove first 2 digits
+    dob_digits = dob_digits[2:]
+    frequency = {num: dob_digits.count(num) for num in range(1, 10)}
+
+    # Generate the grid with counts
+    grid = []
+    for row in VEDIC_MATRIX:
+        grid_row = []
+        for num in row:
+            grid_row.append(str(num) * frequency[num])  # Repeat the number based on its frequency
+        grid.append(grid_row)
+
+    return grid
+
+def calculate_mahadasha_antardasha(birthdate: str, num_years: int = 90):
+    """
+    Mahadasha and Antardasha for `num_years` years starting from the birth year.
+    """
+    birth_year = datetime.strptime(birthdate, "%Y-%m-%d").year
+    return list(iter_timeline(birthdate, birth_year, birth_year + num_years - 1))
+
+
+# Function to check if a given year is a leap year
+def is_leap_year(year):
+    if (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0):
+        return True
+    else:
+        return False
+
+# Function to update the grid based on Mahadasha and Antardasha
+def update_vedic_grid(base_grid, mahadasha, antardasha, start_date):
+    # Create a new updated grid
+    updated_grid = []
+
+    for row_index, row in enumerate(VEDIC_MATRIX):  # Iterate through the original Vedic matrix
+        updated_row = []
+        for col_index, cell in enumerate(row):
+            # Get the current cell value from the base grid
+            current_value = base_grid[row_index][col_index]
+
+            # Append Mahadasha or Antardasha if the position matches
+            if cell == mahadasha:
+                current_value += '[' + str(mahadasha) + ']'
+            if cell == antardasha:
+                current_value += '(' + str(antardasha) + ')'
+
+            updated_row.append(current_value)
+        updated_grid.append(updated_row)
+
+    date_ranges = []
+    current_date = datetime.strptime(start_date, "%d-%m-%Y")
+
+    # Check if the current year is a leap year
+    leap_year_bool = False
+    if current_date.month <= 2:
+        leap_year_bool = is_leap_year(current_date.year)
+    else:
+        leap_year_bool = is_leap_year(current_date.year + 1)
+
+    # Calculate the multiplication factor based on leap year
+    if leap_year_bool:
+        mul_factor = 8.13
+    else:
+        mul_factor = 8.11
+
+    for number in range(antardasha, 10):
+        days = round(number * mul_factor)
+        end_date = current_date + timedelta(days=days-1)
+        date_ranges.append({
+            "start_date": current_date.strftime("%d-%m-%Y"),
+            "end_date": end_date.strftime("%d-%m-%Y"),
+            "number": number
+        })
+        current_date = end_date + timedelta(days=1)
+    
+    for number in range(1, antardasha):
+        days = round(number * mul_factor)
+        end_date = current_date + timedelta(days=days-1)
+        date_ranges.append({
+            "start_date": current_date.strftime("%d-%m-%Y"),
+            "end_date": end_date.strftime("%d-%m-%Y"),
+            "number": number
+        })
+        current_date = end_date + timedelta(days=1)
+    
+    return (updated_grid, date_ranges)
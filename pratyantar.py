@@ -0,0 +1,157 @@
+"""
+Sub-period (pratyantar) calendar: the antardasha date ranges of
+`update_vedic_grid` for every year of a timeline at once.
+
+A year starting on the birthday is split into nine sub-periods, numbered
+from its antardasha up to 9 and then from 1. Sub-period `n` lasts
+round(n * 8.13) days when the coming twelve months contain February 29 and
+round(n * 8.11) days otherwise, so the nine periods cover the year exactly.
+All dates are handled as integer day ordinals (`date.toordinal()`), and a
+sorted array of period starts doubles as the interval index for looking up
+the active sub-period of many dates at once.
+"""
+from datetime import datetime
+
+import numpy as np
+
+import batch
+from timeline import MAHADASHA_CYCLE_YEARS, WEEKDAY_NUMBERS, mahadasha_order
+
+# PERIOD_DAYS[leap][number]: length in days of sub-period `number`, same rounding as update_vedic_grid
+PERIOD_DAYS = np.array([[0] + [round(number * factor) for number in range(1, 10)] for factor in (8.11, 8.13)])
+
+# The periods of a year run into the next one, which must still be a four-digit year
+MAX_YEAR = 9998
+
+# PERIOD_NUMBERS[antardasha]: the nine sub-period numbers in the order they run
+PERIOD_NUMBERS = np.array([[0] * 9] + [
+    list(range(antardasha, 10)) + list(range(1, antardasha)) for antardasha in range(1, 10)
+])
+
+
+def format_ordinals(values):
+    """
+    'DD-MM-YYYY' strings for an array of day ordinals (years up to 9999).
+    """
+    years, months, days = batch.date_parts(values)
+
+    # Write the characters as code points and view them as 10-character strings
+    codes = np.empty((len(values), 10), dtype=np.uint32)
+    codes[:, 0], codes[:, 1] = divmod(days, 10)
+    codes[:, 3], codes[:, 4] = divmod(months, 10)
+    codes[:, 6], codes[:, 7], codes[:, 8], codes[:, 9] = years // 1000, years // 100 % 10, years // 10 % 10, years % 10
+    codes += ord("0")
+    codes[:, [2, 5]] = ord("-")
+    return codes.view("U10").reshape(-1).tolist()
+
+
+class PratyantarCalendar:
+    """
+    Every sub-period of the years `start_year` to `end_year` (inclusive) of a birthdate's timeline.
+    """
+
+    def __init__(self, birthdate: str, start_year: int = None, end_year: int = None):
+        birthdate_dt = datetime.strptime(birthdate, "%Y-%m-%d")
+        day, month, birth_year = birthdate_dt.day, birthdate_dt.month, birthdate_dt.year
+        if month == 2 and day == 29:
+            raise ValueError("The timeline is not defined for February 29 birthdates")
+        if start_year is None:
+            start_year = birth_year
+        if end_year is None:
+            end_year = start_year + 89
+        if not birth_year <= start_year <= end_year <= MAX_YEAR:
+            raise ValueError(f"Expected birth year <= start year <= end year <= {MAX_YEAR}")
+
+        years = np.arange(start_year, end_year + 1, dtype=np.int64)
+        year_starts = batch.date_ordinals(years, month, day)
+
+        # Same arithmetic as timeline.iter_timeline, over the whole span
+        order = np.array(mahadasha_order(day))
+        boundaries = np.cumsum(order) - order
+        mahadashas = order[np.searchsorted(boundaries, (years - birth_year) % MAHADASHA_CYCLE_YEARS, side="right") - 1]
+        weekdays = (year_starts + 6) % 7
+        antardashas = 1 + (day + month + years % 100 + np.array(WEEKDAY_NUMBERS)[weekdays] - 1) % 9
+
+        leap = batch.is_leap(years + (month > 2)).astype(np.int64)
+        numbers = PERIOD_NUMBERS[antardashas]
+        lengths = PERIOD_DAYS[leap[:, None], numbers]
+        starts = year_starts[:, None] + np.cumsum(lengths, axis=1) - lengths
+
+        self.birthdate = birthdate
+        self.start_year = start_year
+        self.end_year = end_year
+        self.years = np.repeat(years, 9)
+        self.mahadashas = np.repeat(mahadashas, 9)
+        self.antardashas = np.repeat(antardashas, 9)
+        self.numbers = numbers.reshape(-1)
+        self.starts = starts.reshape(-1)
+        self.ends = self.starts + lengths.reshape(-1) - 1
+
+    def __len__(self):
+        return len(self.starts)
+
+    def active(self, date_ordinals):
+        """
+        Index of the sub-period containing each day ordinal, -1 outside the calendar.
+        """
+        date_ordinals = np.asarray(date_ordinals, dtype=np.int64)
+        positions = np.searchsorted(self.starts, date_ordinals, side="right") - 1
+        # Periods are contiguous, so only days before the first or after the last period fall outside
+        outside = (positions < 0) | (date_ordinals > self.ends[-1])
+        positions[outside] = -1
+        return positions
+
+    def rows(self, positions=None):
+        """
+        Yield sub-period rows, all of them or those at `positions`.
+
+        Yields:
+        - dict: `year`, `mahadasha` and `antardasha` of the year it belongs to,
+          then `number`, `start_date` and `end_date` as in `update_vedic_grid`
+        """
+        if positions is None:
+            positions = np.arange(len(self))
+        start_dates = format_ordinals(self.starts[positions])
+        end_dates = format_ordinals(self.ends[positions])
+        columns = (self.years, self.mahadashas, self.antardashas, self.numbers)
+        years, mahadashas, antardashas, numbers = (column[positions].tolist() for column in columns)
+        for index in range(len(start_dates)):
+            yield {
+                "year": years[index],
+                "mahadasha": mahadashas[index],
+                "antardasha": antardashas[index],
+                "number": numbers[index],
+                "start_date": start_dates[index],
+                "end_date": end_dates[index],
+            }
+
+
+def active_periods(birthdate: str, dates):
+    """
+    The sub-period active on each of many 'YYYY-MM-DD' dates.
+
+    The calendar spans the birth year up to the year of the latest date
+    (at most MAX_YEAR).
+
+    Returns:
+    - list: one dict per date, with its `index` and `date` and either the
+      active sub-period under `period` (None before the birthday) or an `error`
+    """
+    years, months, days, valid = batch.parse_birthdates(dates)
+    birth_year = datetime.strptime(birthdate, "%Y-%m-%d").year
+    last_year = min(max(int(years.max()) if len(years) else birth_year, birth_year), MAX_YEAR)
+    calendar = PratyantarCalendar(birthdate, birth_year, last_year)
+
+    date_ordinals = np.zeros(len(dates), dtype=np.int64)
+    date_ordinals[valid] = batch.date_ordinals(years[valid], months[valid], days[valid])
+    positions = calendar.active(date_ordinals)
+    found = valid & (positions >= 0)
+    periods = iter(calendar.rows(positions[found]))
+
+    results = []
+    for index, (is_valid, has_period) in enumerate(zip(valid.tolist(), found.tolist())):
+        if not is_valid:
+            results.append({"index": index, "date": dates[index], "error": "Date must be a valid date in the format YYYY-MM-DD"})
+            continue
+        results.append({"index": index, "date": dates[index], "period": next(periods) if has_period else None})
+    return results
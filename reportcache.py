@@ -0,0 +1,89 @@
+"""
+Bounded LRU/TTL cache of computed birthdate reports.
+
+Each cached report gets an opaque id, so the results page can refer to it
+(e.g. from `/update-grid`) instead of sending the report back to the server.
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedReport:
+    __slots__ = ("report_id", "birthdate", "report", "expires", "overlays")
+
+    def __init__(self, report_id, birthdate, report, expires):
+        self.report_id = report_id
+        self.birthdate = birthdate
+        self.report = report
+        self.expires = expires
+        # Per-year grid overlays, filled in on first request
+        self.overlays = None
+
+
+class ReportCache:
+    """
+    Keep at most `maxsize` reports, each for at most `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._by_id = OrderedDict()
+        self._ids_by_birthdate = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def _drop(self, entry):
+        del self._by_id[entry.report_id]
+        del self._ids_by_birthdate[entry.birthdate]
+
+    def _fresh(self, report_id):
+        entry = self._by_id.get(report_id)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._drop(entry)
+            return None
+        self._by_id.move_to_end(report_id)
+        return entry
+
+    def get(self, report_id: str):
+        """
+        Return the CachedReport for `report_id`, or None if it is unknown or expired.
+        """
+        with self._lock:
+            return self._fresh(report_id)
+
+    def lookup(self, birthdate: str):
+        """
+        Return the CachedReport for `birthdate`, or None if it is not cached.
+        """
+        with self._lock:
+            report_id = self._ids_by_birthdate.get(birthdate)
+            return self._fresh(report_id) if report_id is not None else None
+
+    def put(self, birthdate: str, report):
+        """
+        Cache a computed report, keeping the existing entry if one was added meanwhile.
+        """
+        with self._lock:
+            report_id = self._ids_by_birthdate.get(birthdate)
+            entry = self._fresh(report_id) if report_id is not None else None
+            if entry is not None:
+                return entry
+
+            entry = CachedReport(secrets.token_urlsafe(16), birthdate, report, time.monotonic() + self.ttl)
+            self._by_id[entry.report_id] = entry
+            self._ids_by_birthdate[birthdate] = entry.report_id
+            while len(self._by_id) > self.maxsize:
+                self._drop(next(iter(self._by_id.values())))
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._ids_by_birthdate.clear()
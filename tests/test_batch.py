@@ -0,0 +1,62 @@
+"""
+The vectorized batch engine must give exactly the results of the scalar calculators.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+import batch
+from numerology import (
+    calculate_chaldean_number,
+    calculate_destiny_number,
+    calculate_root_number,
+    generate_vedic_grid_dynamic,
+)
+
+NAMES = [
+    "Atin Mathur", "", "   ", "o'brien-smith", "Zoë Ångström", "Straße", "ﬀion", "İlkay",
+    "ǅemal", "ŉ", "Søren Müller", "李小龍", "Ǌ", "\U0001d400bc", "ΐ", "maße ﬃ", "x" * 300,
+]
+
+
+def every_birthdate():
+    day = date(1900, 1, 1)
+    while day <= date(2100, 12, 31):
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+def test_matches_scalar_calculators_for_every_day():
+    birthdates = list(every_birthdate())
+    names = [NAMES[index % len(NAMES)] for index in range(len(birthdates))]
+    report = batch.batch_report(names, birthdates)
+
+    assert report["valid"].all()
+    assert report["destiny_number"].tolist() == [calculate_destiny_number(b) for b in birthdates]
+    assert report["root_number"].tolist() == [calculate_root_number(b) for b in birthdates]
+    assert batch.vedic_grid_strings(report["grid_counts"]) == [generate_vedic_grid_dynamic(b) for b in birthdates]
+    assert report["chaldean_number"].tolist() == [calculate_chaldean_number(name) for name in names]
+
+
+def test_chaldean_numbers_with_non_ascii_upper_casing():
+    assert batch.chaldean_numbers(NAMES).tolist() == [calculate_chaldean_number(name) for name in NAMES]
+
+
+def test_parse_birthdates_rejects_malformed_and_impossible_dates():
+    birthdates = ["2000-1-5", "2000-01-5", "2000-02-30", "1000-02-29", "0000-01-01", "2000-13-01",
+                  "2000-01-01 ", "20000-01-01", "2000/01/01", "", "2000-02-29", "1900-02-28"]
+    years, months, days, valid = batch.parse_birthdates(birthdates)
+    assert valid.tolist() == [False] * 10 + [True, True]
+    assert (years[~valid] == 0).all() and (months[~valid] == 0).all() and (days[~valid] == 0).all()
+    assert years[valid].tolist() == [2000, 1900]
+
+
+def test_invalid_birthdates_do_not_disturb_valid_ones():
+    birthdates = ["1990-05-29", "2000-02-30", "2024-02-29"]
+    report = batch.batch_report(["A"] * 3, birthdates)
+    assert report["valid"].tolist() == [True, False, True]
+    grids = batch.vedic_grid_strings(report["grid_counts"][report["valid"]])
+    assert grids == [generate_vedic_grid_dynamic("1990-05-29"), generate_vedic_grid_dynamic("2024-02-29")]
+    assert np.asarray(report["destiny_number"])[[0, 2]].tolist() == [
+        calculate_destiny_number("1990-05-29"), calculate_destiny_number("2024-02-29")
+    ]
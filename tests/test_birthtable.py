@@ -0,0 +1,90 @@
+"""
+Reports served from the precomputed table must equal the calculators' reports.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+import birthtable
+import main
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("birthtable") / "birthdate_table.bin")
+    birthtable.build_table(path, 1999, 2001)
+    return path
+
+
+@pytest.fixture
+def calculator_report(monkeypatch):
+    monkeypatch.setattr(main, "birth_table", None)
+    return main.birthdate_report
+
+
+def test_report_matches_calculators_for_every_day(table_path, calculator_report):
+    table = birthtable.open_table(table_path)
+    assert table is not None
+    try:
+        day = date(1999, 1, 1)
+        while day <= date(2001, 12, 31):
+            birthdate = day.isoformat()
+            if (day.month, day.day) == (2, 29):
+                assert table.report(birthdate) is None
+            else:
+                assert table.report(birthdate) == calculator_report(birthdate), birthdate
+            day += timedelta(days=1)
+    finally:
+        table.close()
+
+
+def test_dates_outside_the_table_or_malformed_are_not_found(table_path):
+    table = birthtable.open_table(table_path)
+    try:
+        for birthdate in ("1998-12-31", "2002-01-01", "2000-1-05", "2000-02-30", "not a date"):
+            assert table.report(birthdate) is None
+    finally:
+        table.close()
+
+
+def corrupt_copy(table_path, tmp_path, change):
+    with open(table_path, "rb") as table:
+        data = bytearray(table.read())
+    change(data)
+    path = tmp_path / "corrupt.bin"
+    path.write_bytes(bytes(data))
+    return str(path)
+
+
+def test_changed_fingerprint_is_rejected(table_path, tmp_path):
+    # The fingerprint follows the magic and three 16-bit fields
+    fingerprint_offset = 8 + 3 * 2
+
+    def change(data):
+        data[fingerprint_offset] ^= 0xFF
+
+    path = corrupt_copy(table_path, tmp_path, change)
+    with pytest.raises(ValueError, match="out of date"):
+        birthtable.BirthdateTable(path)
+    assert birthtable.open_table(path) is None
+
+
+def test_truncated_table_is_rejected(table_path, tmp_path):
+    def change(data):
+        del data[-birthtable.RECORD.size // 2:]
+
+    path = corrupt_copy(table_path, tmp_path, change)
+    with pytest.raises(ValueError, match="truncated"):
+        birthtable.BirthdateTable(path)
+    assert birthtable.open_table(path) is None
+
+
+def test_wrong_magic_and_missing_file_are_rejected(table_path, tmp_path):
+    def change(data):
+        data[:8] = b"NOTATABL"
+
+    path = corrupt_copy(table_path, tmp_path, change)
+    with pytest.raises(ValueError, match="incompatible format"):
+        birthtable.BirthdateTable(path)
+    assert birthtable.open_table(path) is None
+    assert birthtable.open_table(str(tmp_path / "missing.bin")) is None
@@ -0,0 +1,91 @@
+"""
+PratyantarCalendar must produce exactly the `date_ranges` of
+update_vedic_grid for every year of a timeline.
+"""
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from numerology import update_vedic_grid
+from pratyantar import MAX_YEAR, PratyantarCalendar, active_periods
+from timeline import iter_timeline
+
+EMPTY_GRID = [["", "", ""], ["", "", ""], ["", "", ""]]
+
+BIRTHDATES = [
+    f"{year}-{month_day}"
+    for year in (1900, 2000, 2100)
+    for month_day in ("01-15", "02-28", "03-01", "12-31")
+]
+
+
+def expected_rows(birthdate, start_year=None, end_year=None):
+    rows = []
+    for period in iter_timeline(birthdate, start_year, end_year):
+        _, date_ranges = update_vedic_grid(EMPTY_GRID, period["mahadasha"], period["antardasha"], period["start_date"])
+        for date_range in date_ranges:
+            rows.append({
+                "year": period["year"],
+                "mahadasha": period["mahadasha"],
+                "antardasha": period["antardasha"],
+                **date_range,
+            })
+    return rows
+
+
+def ordinal(ddmmyyyy):
+    return datetime.strptime(ddmmyyyy, "%d-%m-%Y").toordinal()
+
+
+@pytest.mark.parametrize("birthdate", BIRTHDATES)
+def test_matches_update_vedic_grid_for_every_year(birthdate):
+    assert list(PratyantarCalendar(birthdate).rows()) == expected_rows(birthdate)
+
+
+def test_window_up_to_max_year():
+    calendar = PratyantarCalendar("1990-05-29", MAX_YEAR - 120, MAX_YEAR)
+    assert list(calendar.rows()) == expected_rows("1990-05-29", MAX_YEAR - 120, MAX_YEAR)
+
+
+def test_rejects_years_past_max_year_and_february_29():
+    with pytest.raises(ValueError):
+        PratyantarCalendar("1990-05-29", 1990, MAX_YEAR + 1)
+    with pytest.raises(ValueError):
+        PratyantarCalendar("2000-02-29")
+
+
+@pytest.mark.parametrize("birthdate", BIRTHDATES)
+def test_active_at_period_edges(birthdate):
+    calendar = PratyantarCalendar(birthdate)
+    rows = list(calendar.rows())
+    starts = [ordinal(row["start_date"]) for row in rows]
+    ends = [ordinal(row["end_date"]) for row in rows]
+
+    assert starts[0] == date.fromisoformat(birthdate).toordinal()
+    assert calendar.active([starts[0]]).tolist() == [0]
+    assert calendar.active(starts).tolist() == list(range(len(rows)))
+    assert calendar.active(ends).tolist() == list(range(len(rows)))
+    assert calendar.active([starts[0] - 1, ends[-1] + 1]).tolist() == [-1, -1]
+
+
+def test_active_periods_by_date():
+    birthdate = "2000-03-01"
+    rows = expected_rows(birthdate, 2000, 2001)
+    dates = ["2000-02-29", "2000-03-01", datetime.strptime(rows[0]["end_date"], "%d-%m-%Y").date().isoformat(),
+             datetime.strptime(rows[-1]["end_date"], "%d-%m-%Y").date().isoformat(), "2000-02-30"]
+    results = active_periods(birthdate, dates)
+    assert results[0]["period"] is None
+    assert results[1]["period"] == rows[0]
+    assert results[2]["period"] == rows[0]
+    assert results[3]["period"] == rows[-1]
+    assert "error" in results[4]
+
+
+def test_active_accepts_arrays():
+    calendar = PratyantarCalendar("1990-05-29")
+    ordinals = np.arange(calendar.starts[0] - 2, calendar.ends[-1] + 3)
+    positions = calendar.active(ordinals)
+    assert (positions[:2] == -1).all() and (positions[-2:] == -1).all()
+    inside = positions[2:-2]
+    assert (calendar.starts[inside] <= ordinals[2:-2]).all() and (ordinals[2:-2] <= calendar.ends[inside]).all()
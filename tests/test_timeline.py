@@ -0,0 +1,88 @@
+"""
+timeline.iter_timeline must return exactly what the original
+calculate_mahadasha_antardasha returned, for every birthdate from 1900 to 2100.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from numerology import calculate_mahadasha_antardasha
+from timeline import iter_timeline
+
+
+def original_mahadasha_antardasha(birthdate: str, num_years: int = 90):
+    # The year-by-year implementation that timeline.py replaced, kept as the reference
+    birthdate_dt = datetime.strptime(birthdate, "%Y-%m-%d")
+    day, month, year = birthdate_dt.day, birthdate_dt.month, birthdate_dt.year
+    root_number = sum(int(digit) for digit in str(day))
+    while root_number > 9:
+        root_number = sum(int(digit) for digit in str(root_number))
+
+    mahadasha_order = []
+    start = root_number
+    for _ in range(9):  # One cycle
+        mahadasha_order.append(start)
+        start += 1
+        if start > 9:
+            start = 1
+
+    results = []
+    current_year = year
+    mahadasha_index = 0
+    mahadasha_start_year = year
+
+    for i in range(num_years):
+        current_birthday = datetime(current_year + i, month, day)
+        if current_year + i >= mahadasha_start_year + mahadasha_order[mahadasha_index]:
+            mahadasha_index = (mahadasha_index + 1) % len(mahadasha_order)
+            mahadasha_start_year = current_year + i
+
+        mahadasha = mahadasha_order[mahadasha_index]
+        sum_dob = day + month + (current_year + i) % 100
+        weekday = current_birthday.weekday()
+        weekday_map = {0: 2, 1: 9, 2: 5, 3: 3, 4: 6, 5: 8, 6: 1}
+        sum_dob += weekday_map[weekday]
+        while sum_dob > 9:
+            sum_dob = sum(int(digit) for digit in str(sum_dob))
+        antardasha = sum_dob
+        running_age = (current_year + i) - year + 1
+        results.append({
+            "year": current_year + i,
+            "start_date": current_birthday.strftime("%d-%m-%Y"),
+            "running_age": running_age,
+            "mahadasha": mahadasha,
+            "antardasha": antardasha,
+        })
+
+    return results
+
+
+def birthdates_of(year):
+    day = date(year, 1, 1)
+    while day.year == year:
+        if (day.month, day.day) != (2, 29):
+            yield day.isoformat()
+        day += timedelta(days=1)
+
+
+@pytest.mark.parametrize("year", range(1900, 2101))
+def test_matches_original_for_every_birthdate(year):
+    for birthdate in birthdates_of(year):
+        assert calculate_mahadasha_antardasha(birthdate) == original_mahadasha_antardasha(birthdate), birthdate
+
+
+def test_window_matches_slice_of_full_timeline():
+    full = original_mahadasha_antardasha("1990-05-29", 200)
+    assert list(iter_timeline("1990-05-29", 2020, 2150)) == full[30:161]
+
+
+def test_february_29_raises_like_original():
+    with pytest.raises(ValueError):
+        original_mahadasha_antardasha("2000-02-29")
+    with pytest.raises(ValueError):
+        calculate_mahadasha_antardasha("2000-02-29")
+
+
+def test_start_before_birth_year_raises():
+    with pytest.raises(ValueError):
+        list(iter_timeline("1990-05-29", 1989))
@@ -0,0 +1,73 @@
+"""
+Mahadasha / Antardasha timeline engine.
+
+Every year is computed directly from the birthdate, so any window of years
+can be generated lazily without walking the cycle from the birth year.
+"""
+from bisect import bisect_right
+from datetime import date, datetime
+
+# Number assigned to each weekday, Monday first
+WEEKDAY_NUMBERS = (2, 9, 5, 3, 6, 8, 1)
+
+# Each mahadasha lasts as many years as its number, so one cycle is 1 + 2 + ... + 9 years
+MAHADASHA_CYCLE_YEARS = 45
+
+
+def digital_root(number: int) -> int:
+    """
+    Repeatedly sum the digits of a positive number until a single digit remains.
+    """
+    return 1 + (number - 1) % 9
+
+
+def mahadasha_order(day: int):
+    """
+    The nine mahadashas in the order they run, starting from the root of the birth day.
+    """
+    root = digital_root(day)
+    return [(root - 1 + offset) % 9 + 1 for offset in range(9)]
+
+
+def antardasha(day: int, month: int, year: int) -> int:
+    """
+    Antardasha for the year starting on the birthday in `year`.
+    """
+    weekday = date(year, month, day).weekday()
+    return digital_root(day + month + year % 100 + WEEKDAY_NUMBERS[weekday])
+
+
+def iter_timeline(birthdate: str, start_year: int = None, end_year: int = None):
+    """
+    Lazily yield the timeline rows of `calculate_mahadasha_antardasha`.
+
+    Args:
+    - birthdate (str): Birthdate in the format 'YYYY-MM-DD'
+    - start_year (int): First year to yield, defaults to the birth year
+    - end_year (int): Last year to yield, defaults to 89 years after `start_year`
+
+    Yields:
+    - dict: One row per year with `year`, `start_date`, `running_age`,
+      `mahadasha` and `antardasha`
+    """
+    birthdate_dt = datetime.strptime(birthdate, "%Y-%m-%d")
+    day, month, birth_year = birthdate_dt.day, birthdate_dt.month, birthdate_dt.year
+    if start_year is None:
+        start_year = birth_year
+    if end_year is None:
+        end_year = start_year + 89
+    if start_year < birth_year:
+        raise ValueError("The timeline starts in the birth year")
+
+    order = mahadasha_order(day)
+    # Offset within the 45-year cycle at which each mahadasha starts
+    boundaries = [sum(order[:index]) for index in range(9)]
+    for year in range(start_year, end_year + 1):
+        offset = year - birth_year
+        yield {
+            "year": year,
+            "start_date": f"{day:02d}-{month:02d}-{year}",
+            "running_age": offset + 1,
+            "mahadasha": order[bisect_right(boundaries, offset % MAHADASHA_CYCLE_YEARS) - 1],
+            "antardasha": antardasha(day, month, year),
+        }